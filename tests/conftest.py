@@ -3,47 +3,185 @@ Configuración de pytest y fixtures para tests de TecSalud MVP.
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
 import httpx
+import io
+import json
 import os
-import time
-import tempfile
-from typing import Generator, Dict, Any, List
+import uuid
+from datetime import datetime
+from typing import Generator, List
+from bson import ObjectId
 from pymongo import MongoClient
 from pymongo.database import Database
 from pymongo.collection import Collection
-import requests
+
+try:
+    # uvicorn[standard] instala uvloop, el loop que usa la app en producción
+    import uvloop
+except ImportError:
+    uvloop = None
+
+from tests.utils import InMemoryAzureIO, TestAPIHelper
 
 
 # Configuración base
 BASE_URL = "http://localhost:8000"
 TEST_TIMEOUT = 30
 
+# Por defecto la app se ejecuta en proceso vía ASGI (sin sockets ni uvicorn).
+# USE_LIVE_SERVER=1 ejecuta los tests contra el servidor levantado en BASE_URL.
+USE_LIVE_SERVER = os.environ.get("USE_LIVE_SERVER") == "1"
+
+# Con pytest-xdist cada worker (gw0, gw1, ...) usa su propia base de datos para que
+# clean_database no borre datos de otros workers. Solo aplica a la app en proceso:
+# un servidor real comparte una única base de datos entre todos los workers.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+if XDIST_WORKER and not USE_LIVE_SERVER:
+    # Debe definirse antes de importar la app, que lee la configuración al cargarse
+    os.environ["MONGODB_DATABASE"] = f"tecsalud_chatbot_{XDIST_WORKER}"
+
+# Por defecto Azure Blob Storage y Document Intelligence se sustituyen por fakes en
+# memoria; REAL_IO=1 (o el marcador real_io en un test) usa los servicios reales.
+REAL_IO = os.environ.get("REAL_IO") == "1"
+
+# PYTEST_FAST=1 deja fuera los tests marcados como slow (equivale a -m "not slow")
+# para iterar rápido durante el desarrollo.
+PYTEST_FAST = os.environ.get("PYTEST_FAST") == "1"
+
+MONGODB_URL = os.environ.get("MONGODB_URL", "mongodb://localhost:27017")
+TEST_DATABASE_NAME = os.environ.get("MONGODB_DATABASE", "tecsalud_chatbot")
+
+# Colecciones que se vacían entre tests
+CLEANUP_COLLECTIONS = ["documents", "chat_sessions", "chat_interactions", "pills"]
+
 
 @pytest.fixture(scope="session")
 def event_loop():
-    """Crear event loop para toda la sesión de tests."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    """Crear event loop para toda la sesión de tests (uvloop si está disponible)."""
+    loop = uvloop.new_event_loop() if uvloop else asyncio.get_event_loop_policy().new_event_loop()
     yield loop
     loop.close()
 
 
+# Requests de calentamiento: rutas y middleware, consulta a MongoDB y esquema OpenAPI
+WARMUP_PATHS = ["/health", "/api/v1/documents/?user_id=warmup&limit=1", "/openapi.json"]
+
+
+def _warm_up(client: httpx.Client) -> None:
+    """
+    Pagar una sola vez por sesión el coste del primer request (pool de MongoDB,
+    clientes de Azure, esquema OpenAPI) en lugar de cargarlo al primer test.
+    """
+    for path in WARMUP_PATHS:
+        try:
+            client.get(path)
+        except httpx.HTTPError:
+            # Servidor no disponible: server_health_check omitirá los tests
+            pass
+
+
 @pytest.fixture(scope="session")
-def api_client():
-    """Cliente HTTP para hacer requests a la API."""
-    return httpx.Client(base_url=BASE_URL, timeout=TEST_TIMEOUT)
+def azure_io():
+    """
+    Fakes en memoria de Azure Blob Storage y Document Intelligence para la sesión.
+    No se instalan contra un servidor real ni con REAL_IO=1.
+    """
+    fakes = InMemoryAzureIO()
+    if not USE_LIVE_SERVER and not REAL_IO:
+        fakes.install()
+    
+    yield fakes
+    
+    fakes.uninstall()
+
+
+@pytest.fixture(autouse=True)
+def real_io_opt_in(request):
+    """Desactivar los fakes de Azure durante los tests marcados con real_io."""
+    if request.node.get_closest_marker("real_io") is None or "api_client" not in request.fixturenames:
+        yield
+        return
+    
+    fakes = request.getfixturevalue("azure_io")
+    was_installed = fakes.installed
+    fakes.uninstall()
+    
+    yield
+    
+    if was_installed:
+        fakes.install()
 
 
 @pytest.fixture(scope="session")
-def async_api_client():
-    """Cliente HTTP asíncrono para hacer requests a la API."""
-    return httpx.AsyncClient(base_url=BASE_URL, timeout=TEST_TIMEOUT)
+def api_client(azure_io):
+    """
+    Cliente HTTP para hacer requests a la API.
+    
+    Usa TestClient sobre la app ASGI en proceso; con USE_LIVE_SERVER=1
+    apunta al servidor en ejecución en BASE_URL.
+    """
+    if USE_LIVE_SERVER:
+        client = httpx.Client(base_url=BASE_URL, timeout=TEST_TIMEOUT)
+    else:
+        from fastapi.testclient import TestClient
+        from main import app
+        
+        # Los errores no controlados deben llegar como 500, igual que en el servidor real
+        client = TestClient(app, raise_server_exceptions=False)
+    
+    with client:
+        _warm_up(client)
+        yield client
+
+
+@pytest.fixture(scope="session")
+def http_api_client():
+    """
+    Cliente HTTP contra el servidor uvicorn en BASE_URL.
+    
+    Para los pocos tests que deben atravesar el servidor real (p. ej. streaming SSE,
+    que TestClient entrega en bloque); se omiten si el servidor no está disponible.
+    """
+    client = httpx.Client(base_url=BASE_URL, timeout=TEST_TIMEOUT)
+    try:
+        client.get("/health")
+    except httpx.TransportError as e:
+        client.close()
+        pytest.skip(f"Cannot connect to server: {e}")
+    
+    with client:
+        yield client
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_api_client(azure_io):
+    """
+    Cliente HTTP asíncrono para hacer requests a la API.
+    
+    Usa la app en proceso con los fakes de Azure, igual que api_client;
+    con USE_LIVE_SERVER=1 apunta al servidor en ejecución en BASE_URL.
+    """
+    if USE_LIVE_SERVER:
+        client = httpx.AsyncClient(base_url=BASE_URL, timeout=TEST_TIMEOUT)
+    else:
+        from main import app
+        
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://testserver",
+            timeout=TEST_TIMEOUT
+        )
+    
+    async with client:
+        yield client
 
 
 @pytest.fixture(scope="session")
 def mongodb_client():
     """Cliente de MongoDB para operaciones de base de datos."""
-    client = MongoClient("mongodb://localhost:27017")
+    client = MongoClient(MONGODB_URL)
     yield client
     client.close()
 
@@ -51,45 +189,58 @@ def mongodb_client():
 @pytest.fixture(scope="session")
 def mongodb_database(mongodb_client):
     """Base de datos de MongoDB para tests."""
-    return mongodb_client["tecsalud_chatbot"]
+    return mongodb_client[TEST_DATABASE_NAME]
 
 
-@pytest.fixture(scope="function")
-def clean_database(mongodb_database):
-    """
-    Limpiar la base de datos antes de cada test.
-    Esto asegura que cada test empiece con una base de datos limpia.
-    """
-    # Limpiar todas las colecciones
-    collections_to_clean = [
-        "documents",
-        "chat_sessions", 
-        "chat_interactions",
-        "pills"
-    ]
-    
-    for collection_name in collections_to_clean:
+def _purge_collections(database: Database) -> None:
+    """Vaciar las colecciones de datos de prueba sin eliminarlas."""
+    for collection_name in CLEANUP_COLLECTIONS:
         try:
-            mongodb_database[collection_name].delete_many({})
+            database[collection_name].delete_many({})
         except Exception as e:
             # Ignorar errores si la colección no existe
             pass
+
+
+@pytest.fixture(scope="session")
+def test_database(mongodb_database):
+    """
+    Preparar la base de datos una sola vez por sesión.
+    Crea las colecciones que falten y la deja limpia al terminar la sesión;
+    los índices los crea la aplicación al arrancar y se conservan entre tests.
+    """
+    try:
+        existing_collections = set(mongodb_database.list_collection_names())
+        for collection_name in CLEANUP_COLLECTIONS:
+            if collection_name not in existing_collections:
+                mongodb_database.create_collection(collection_name)
+    except Exception as e:
+        # Sin MongoDB disponible los tests que lo necesiten fallarán por sí mismos
+        pass
     
     yield mongodb_database
     
-    # Limpiar después del test también
-    for collection_name in collections_to_clean:
-        try:
-            mongodb_database[collection_name].delete_many({})
-        except Exception as e:
-            pass
+    _purge_collections(mongodb_database)
 
 
-@pytest.fixture
+@pytest.fixture(scope="function")
+def clean_database(test_database):
+    """
+    Limpiar la base de datos antes de cada test.
+    Esto asegura que cada test empiece con una base de datos limpia; solo se
+    vacían documentos, las colecciones e índices se mantienen durante la sesión.
+    """
+    _purge_collections(test_database)
+    
+    yield test_database
+
+
+@pytest.fixture(scope="session")
 def sample_pdf_file():
     """
-    Crear un archivo PDF de prueba temporal con nombre médico válido.
-    Devuelve una tupla (file_path, medical_filename)
+    PDF de prueba con nombre médico válido.
+    Se crea una vez por sesión; devuelve un dict con filename y bytes para
+    construir los uploads en memoria (io.BytesIO) sin tocar el disco.
     """
     # Crear contenido PDF básico
     pdf_content = b"""%PDF-1.4
@@ -146,27 +297,20 @@ startxref
 285
 %%EOF"""
     
-    # Crear archivo temporal con nombre médico válido
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-        temp_file.write(pdf_content)
-        temp_file_path = temp_file.name
-    
     # Nombre médico válido para usar en tests
     medical_filename = "4000123456_GARCIA LOPEZ, MARIA_6001467010_CONS.pdf"
     
-    yield (temp_file_path, medical_filename)
-    
-    # Limpiar archivo temporal
-    try:
-        os.unlink(temp_file_path)
-    except FileNotFoundError:
-        pass
+    return {
+        "filename": medical_filename,
+        "bytes": pdf_content
+    }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_medical_pdf_file():
     """
-    Crear un archivo PDF con nombre médico válido para pruebas.
+    PDF médico con nombre válido y los metadatos que se esperan de su nombre.
+    Se crea una vez por sesión en memoria; el contenido va en "bytes".
     """
     # Crear contenido PDF médico simulado
     pdf_content = b"""%PDF-1.4
@@ -227,71 +371,78 @@ startxref
 341
 %%EOF"""
     
-    # Crear archivo temporal con nombre médico
+    # Nombre de archivo médico
     filename = "4000123456_GARCIA LOPEZ, MARIA_6001467010_EMER.pdf"
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-        temp_file.write(pdf_content)
-        temp_file_path = temp_file.name
     
-    yield {
-        "path": temp_file_path,
+    return {
         "filename": filename,
+        "bytes": pdf_content,
         "expediente": "4000123456",
         "nombre_paciente": "GARCIA LOPEZ, MARIA",
         "numero_episodio": "6001467010",  # Corregido a 10 dígitos
         "categoria": "EMER"
     }
-    
-    # Limpiar archivo temporal
-    try:
-        os.unlink(temp_file_path)
-    except FileNotFoundError:
-        pass
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_user_data():
-    """Datos de usuario de prueba consistentes."""
+    """
+    Datos de usuario de prueba consistentes.
+    Incluye los tags ya serializados como el array JSON que espera el endpoint de upload.
+    """
+    tags = ["test", "automation", "pytest"]
     return {
         "user_id": "test_user_001",
         "alternative_user_id": "test_user_002",
         "description": "Documento de prueba para testing",
-        "tags": ["test", "automation", "pytest"]
+        "tags": tags,
+        "tags_json": json.dumps(tags)
     }
 
 
+@pytest.fixture(scope="session")
+def session_user_registry(mongodb_database):
+    """
+    Registro de los user_id únicos generados durante la sesión.
+    Al finalizar se eliminan sus datos con un único borrado por colección.
+    """
+    user_ids: List[str] = []
+    
+    yield user_ids
+    
+    if not user_ids:
+        return
+    
+    for collection_name in ["documents", "chat_sessions", "chat_interactions"]:
+        try:
+            mongodb_database[collection_name].delete_many({"user_id": {"$in": user_ids}})
+        except Exception as e:
+            pass
+
+
 @pytest.fixture
+def unique_user_data(test_user_data, session_user_registry):
+    """
+    Datos de usuario con IDs únicos por test.
+    Evita limpiar la base de datos en cada test: los datos quedan aislados por usuario.
+    """
+    user_data = {
+        **test_user_data,
+        "user_id": f"u_{uuid.uuid4().hex}",
+        "alternative_user_id": f"u_{uuid.uuid4().hex}"
+    }
+    session_user_registry.extend([user_data["user_id"], user_data["alternative_user_id"]])
+    
+    return user_data
+
+
+@pytest.fixture(scope="session")
 def wait_for_processing():
     """
     Helper para esperar a que se complete el procesamiento de documentos.
+    Devuelve TestAPIHelper.wait_for_document_processing (polling con backoff exponencial).
     """
-    def _wait_for_processing(api_client, document_id: str, max_wait: int = 30) -> Dict[str, Any]:
-        """
-        Esperar a que se complete el procesamiento de un documento.
-        
-        Args:
-            api_client: Cliente HTTP
-            document_id: ID del documento
-            max_wait: Tiempo máximo de espera en segundos
-            
-        Returns:
-            Información del documento procesado
-        """
-        start_time = time.time()
-        
-        while time.time() - start_time < max_wait:
-            response = api_client.get(f"/api/v1/documents/{document_id}")
-            
-            if response.status_code == 200:
-                doc_info = response.json()
-                if doc_info.get("processing_status") in ["completed", "failed"]:
-                    return doc_info
-            
-            time.sleep(1)
-        
-        raise TimeoutError(f"Document processing did not complete within {max_wait} seconds")
-    
-    return _wait_for_processing
+    return TestAPIHelper.wait_for_document_processing
 
 
 @pytest.fixture
@@ -316,19 +467,18 @@ def uploaded_document(api_client, clean_database, sample_medical_pdf_file, test_
     Útil para tests que necesitan un documento ya procesado.
     """
     # Subir documento
-    with open(sample_medical_pdf_file["path"], "rb") as file:
-        files = {"file": (sample_medical_pdf_file["filename"], file, "application/pdf")}
-        data = {
-            "user_id": test_user_data["user_id"],
-            "description": test_user_data["description"],
-            "tags": str(test_user_data["tags"])
-        }
-        
-        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-        assert response.status_code == 201
-        
-        upload_result = response.json()
-        document_id = upload_result["document_id"]
+    files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+    data = {
+        "user_id": test_user_data["user_id"],
+        "description": test_user_data["description"],
+        "tags": test_user_data["tags_json"]
+    }
+    
+    response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+    assert response.status_code == 201
+    
+    upload_result = response.json()
+    document_id = upload_result["document_id"]
     
     # Esperar a que se complete el procesamiento
     processed_doc = wait_for_processing(api_client, document_id)
@@ -342,6 +492,51 @@ def uploaded_document(api_client, clean_database, sample_medical_pdf_file, test_
     }
 
 
+@pytest.fixture(scope="module")
+def shared_uploaded_document(api_client, sample_medical_pdf_file, session_user_registry, wait_for_processing):
+    """
+    Documento procesado que se sube una sola vez por módulo para tests de solo lectura.
+    Usa un user_id único para que los listados no dependan de otros tests; los tests
+    que lo usan no deben modificarlo ni limpiar la base de datos.
+    """
+    user_id = f"u_{uuid.uuid4().hex}"
+    session_user_registry.append(user_id)
+    
+    files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+    response = api_client.post("/api/v1/documents/upload", files=files, data={"user_id": user_id})
+    assert response.status_code == 201
+    
+    document_id = response.json()["document_id"]
+    wait_for_processing(api_client, document_id)
+    
+    yield {
+        "document_id": document_id,
+        "user_id": user_id
+    }
+
+
+@pytest.fixture
+def inserted_document(clean_database, test_user_data):
+    """
+    Fixture que inserta un documento ya procesado directamente en MongoDB.
+    Para tests que solo necesitan que el documento exista (p. ej. eliminación),
+    sin pasar por upload, OCR ni Azure Storage.
+    """
+    object_id = ObjectId()
+    clean_database["documents"].insert_one({
+        "_id": object_id,
+        "filename": "4000123456_GARCIA LOPEZ, MARIA_6001467010_CONS.pdf",
+        "user_id": test_user_data["user_id"],
+        "processing_status": "completed",
+        "created_at": datetime.now(),
+        "updated_at": datetime.now()
+    })
+    
+    yield {"document_id": str(object_id)}
+    
+    clean_database["documents"].delete_one({"_id": object_id})
+
+
 @pytest.fixture
 def chat_session(api_client, uploaded_document):
     """
@@ -367,14 +562,14 @@ def chat_session(api_client, uploaded_document):
 
 
 @pytest.fixture(scope="function")
-def token_cache_cleanup():
+def token_cache_cleanup(api_client):
     """
     Limpiar cache de tokens antes y después de cada test.
     """
     # Limpiar antes del test
     try:
-        requests.post(f"{BASE_URL}/api/v1/tokens/speech/invalidate")
-        requests.post(f"{BASE_URL}/api/v1/tokens/storage/invalidate")
+        api_client.post("/api/v1/tokens/speech/invalidate")
+        api_client.post("/api/v1/tokens/storage/invalidate")
     except:
         pass
     
@@ -382,8 +577,8 @@ def token_cache_cleanup():
     
     # Limpiar después del test
     try:
-        requests.post(f"{BASE_URL}/api/v1/tokens/speech/invalidate")
-        requests.post(f"{BASE_URL}/api/v1/tokens/storage/invalidate")
+        api_client.post("/api/v1/tokens/speech/invalidate")
+        api_client.post("/api/v1/tokens/storage/invalidate")
     except:
         pass
 
@@ -403,6 +598,12 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "api: marca tests de API"
     )
+    config.addinivalue_line(
+        "markers", "xdist_group(name): agrupa tests en un mismo worker con --dist loadgroup"
+    )
+    config.addinivalue_line(
+        "markers", "real_io: usa Azure Blob Storage y Document Intelligence reales en lugar de fakes"
+    )
 
 
 def pytest_collection_modifyitems(config, items):
@@ -413,6 +614,18 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(pytest.mark.integration)
             item.add_marker(pytest.mark.api)
         
+        # Los tests contra el servidor real son lentos por definición
+        if "http_api_client" in item.fixturenames:
+            item.add_marker(pytest.mark.integration)
+            item.add_marker(pytest.mark.slow)
+        
         # Marcar tests lentos
         if any(keyword in item.name.lower() for keyword in ["upload", "process", "batch", "chat"]):
-            item.add_marker(pytest.mark.slow) 
\ No newline at end of file
+            item.add_marker(pytest.mark.slow)
+    
+    if PYTEST_FAST:
+        # Deseleccionar en la colección: los fixtures de los tests lentos no llegan a crearse
+        slow_items = [item for item in items if item.get_closest_marker("slow")]
+        if slow_items:
+            config.hook.pytest_deselected(items=slow_items)
+            items[:] = [item for item in items if not item.get_closest_marker("slow")]
\ No newline at end of file
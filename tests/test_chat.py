@@ -4,10 +4,37 @@ Incluye creación de sesiones, listado, preguntas con streaming, estadísticas y
 """
 
 import pytest
-import json
+import asyncio
+import io
 import time
-import httpx
+import uuid
+import orjson
 from typing import Dict, Any
+from pydantic import ValidationError
+
+from app.apis.v1.types_in import ChatQuestionData
+from tests.utils import iter_sse_events, rjson
+
+
+SESSIONS_URL = "/api/v1/chat/sessions"
+SESSION_URL = "/api/v1/chat/sessions/{sid}"
+SESSION_INTERACTIONS_URL = "/api/v1/chat/sessions/{sid}/interactions"
+ASK_URL = "/api/v1/chat/ask"
+STATS_URL = "/api/v1/chat/stats"
+UPLOAD_URL = "/api/v1/documents/upload"
+DOCUMENT_URL = "/api/v1/documents/{doc_id}"
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _ask_body(chat_session: Dict[str, Any], question: str) -> bytes:
+    """Cuerpo serializado de /chat/ask para la sesión dada."""
+    return orjson.dumps({
+        "session_id": chat_session["session_id"],
+        "user_id": chat_session["document"]["user_data"]["user_id"],
+        "document_id": chat_session["document"]["document_id"],
+        "question": question
+    })
 
 
 class TestChatSessions:
@@ -21,11 +48,11 @@ class TestChatSessions:
             "session_name": "Test Chat Session"
         }
         
-        response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        response = api_client.post(SESSIONS_URL, json=session_data)
         
         assert response.status_code == 201
         
-        session = response.json()
+        session = rjson(response)
         assert "session_id" in session
         assert session["user_id"] == session_data["user_id"]
         assert session["document_id"] == session_data["document_id"]
@@ -42,11 +69,11 @@ class TestChatSessions:
             "document_id": uploaded_document["document_id"]
         }
         
-        response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        response = api_client.post(SESSIONS_URL, json=session_data)
         
         assert response.status_code == 201
         
-        session = response.json()
+        session = rjson(response)
         assert "session_name" in session
         assert session["session_name"] is not None
         assert len(session["session_name"]) > 0
@@ -60,7 +87,7 @@ class TestChatSessions:
             "session_name": "Test Session"
         }
         
-        response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        response = api_client.post(SESSIONS_URL, json=session_data)
         
         assert response.status_code == 400
 
@@ -68,11 +95,11 @@ class TestChatSessions:
     def test_create_chat_session_missing_required_fields(self, api_client, clean_database):
         """Test de error con campos requeridos faltantes."""
         # Sin user_id
-        response1 = api_client.post("/api/v1/chat/sessions", json={"document_id": "test"})
+        response1 = api_client.post(SESSIONS_URL, json={"document_id": "test"})
         assert response1.status_code == 422
         
         # Sin document_id
-        response2 = api_client.post("/api/v1/chat/sessions", json={"user_id": "test"})
+        response2 = api_client.post(SESSIONS_URL, json={"user_id": "test"})
         assert response2.status_code == 422
 
     def test_create_chat_session_long_name(self, api_client, uploaded_document):
@@ -85,10 +112,10 @@ class TestChatSessions:
             "session_name": long_name
         }
         
-        response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        response = api_client.post(SESSIONS_URL, json=session_data)
         
         assert response.status_code == 201
-        assert response.json()["session_name"] == long_name
+        assert rjson(response)["session_name"] == long_name
 
     @pytest.mark.edge_case
     def test_create_chat_session_too_long_name(self, api_client, uploaded_document):
@@ -101,7 +128,7 @@ class TestChatSessions:
             "session_name": too_long_name
         }
         
-        response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        response = api_client.post(SESSIONS_URL, json=session_data)
         
         assert response.status_code == 422
 
@@ -117,12 +144,12 @@ class TestChatSessions:
             "session_name": "Unauthorized Session"
         }
         
-        response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        response = api_client.post(SESSIONS_URL, json=session_data)
         
         # Verificar que se devuelve HTTP 500 con formato específico
         assert response.status_code == 500
         
-        result = response.json()
+        result = rjson(response)
         
         # Verificar estructura específica del error
         assert "error_code" in result
@@ -166,11 +193,11 @@ class TestChatSessionExceptions:
                 "session_name": "Test Session"
             }
             
-            response = api_client.post("/api/v1/chat/sessions", json=session_data)
+            response = api_client.post(SESSIONS_URL, json=session_data)
             
             # Algunas validaciones son interceptadas por FastAPI (422) y otras por nuestro código (400)
             assert response.status_code in [400, 422]
-            data = response.json()
+            data = rjson(response)
             
             if response.status_code == 400:
                 # Nuestro validador personalizado - estructura anidada
@@ -217,11 +244,11 @@ class TestChatSessionExceptions:
                 "session_name": "Test Session"
             }
             
-            response = api_client.post("/api/v1/chat/sessions", json=session_data)
+            response = api_client.post(SESSIONS_URL, json=session_data)
             
             # Algunas validaciones son interceptadas por FastAPI (422) y otras por nuestro código (400)
             assert response.status_code in [400, 422]
-            data = response.json()
+            data = rjson(response)
             
             if response.status_code == 400:
                 # Nuestro validador personalizado - estructura anidada
@@ -249,10 +276,10 @@ class TestChatSessionExceptions:
             "session_name": "Test Session"
         }
         
-        response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        response = api_client.post(SESSIONS_URL, json=session_data)
         
         assert response.status_code == 404
-        data = response.json()
+        data = rjson(response)
         
         # Check main error structure
         assert "error_code" in data
@@ -273,11 +300,11 @@ class TestChatSessionExceptions:
         """Test de error con datos vacíos."""
         session_data = {}
         
-        response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        response = api_client.post(SESSIONS_URL, json=session_data)
         
         # FastAPI validation should catch this before our custom validation
         assert response.status_code == 422
-        error_data = response.json()
+        error_data = rjson(response)
         assert "detail" in error_data
 
     @pytest.mark.edge_case
@@ -289,11 +316,11 @@ class TestChatSessionExceptions:
             "session_name": "Test Session"
         }
         
-        response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        response = api_client.post(SESSIONS_URL, json=session_data)
         
         # FastAPI validation should catch this
         assert response.status_code == 422
-        error_data = response.json()
+        error_data = rjson(response)
         assert "detail" in error_data
 
     @pytest.mark.edge_case
@@ -315,12 +342,12 @@ class TestChatSessionExceptions:
                 "session_name": problematic_name
             }
             
-            response = api_client.post("/api/v1/chat/sessions", json=session_data)
+            response = api_client.post(SESSIONS_URL, json=session_data)
             
             # La validación de session_name debería atrapar algunos casos
             # pero otros podrían pasar a través de FastAPI validation
             assert response.status_code in [400, 422]
-            data = response.json()
+            data = rjson(response)
             
             if response.status_code == 400:
                 # Nuestro validador personalizado - estructura anidada
@@ -365,10 +392,10 @@ class TestChatSessionExceptions:
                 "session_name": case["session_name"]
             }
             
-            response = api_client.post("/api/v1/chat/sessions", json=session_data)
+            response = api_client.post(SESSIONS_URL, json=session_data)
             
             assert response.status_code == 201
-            session = response.json()
+            session = rjson(response)
             assert "session_id" in session
             assert session["user_id"] == case["user_id"]
             assert session["document_id"] == uploaded_document["document_id"]
@@ -388,10 +415,10 @@ class TestChatSessionExceptions:
             "session_name": "Test Session"
         }
         
-        response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        response = api_client.post(SESSIONS_URL, json=session_data)
         
         assert response.status_code == 400
-        data = response.json()
+        data = rjson(response)
         
         # Verificar estructura principal
         main_required_fields = ["error_code", "error_message", "timestamp"]
@@ -422,11 +449,11 @@ class TestChatSessionListing:
 
     def test_list_sessions_empty(self, api_client, clean_database, test_user_data):
         """Test de listado cuando no hay sesiones."""
-        response = api_client.get(f"/api/v1/chat/sessions?user_id={test_user_data['user_id']}")
+        response = api_client.get(SESSIONS_URL, params={"user_id": test_user_data["user_id"]})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert "sessions" in result
         assert len(result["sessions"]) == 0
         assert result["total_found"] == 0
@@ -435,11 +462,11 @@ class TestChatSessionListing:
         """Test de listado con sesiones existentes."""
         user_id = chat_session["document"]["user_data"]["user_id"]
         
-        response = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}")
+        response = api_client.get(SESSIONS_URL, params={"user_id": user_id})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert len(result["sessions"]) == 1
         
         session = result["sessions"][0]
@@ -449,7 +476,7 @@ class TestChatSessionListing:
     @pytest.mark.edge_case
     def test_list_sessions_missing_user_id(self, api_client, clean_database):
         """Test de error al no proporcionar user_id."""
-        response = api_client.get("/api/v1/chat/sessions")
+        response = api_client.get(SESSIONS_URL)
         
         assert response.status_code == 400
 
@@ -458,11 +485,11 @@ class TestChatSessionListing:
         user_id = chat_session["document"]["user_data"]["user_id"]
         document_id = chat_session["document"]["document_id"]
         
-        response = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}&document_id={document_id}")
+        response = api_client.get(SESSIONS_URL, params={"user_id": user_id, "document_id": document_id})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert len(result["sessions"]) == 1
         assert result["sessions"][0]["document_id"] == document_id
 
@@ -471,11 +498,11 @@ class TestChatSessionListing:
         user_id = chat_session["document"]["user_data"]["user_id"]
         nonexistent_doc_id = "60f7b3b8e8f4c2a1b8d3e4f5"
         
-        response = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}&document_id={nonexistent_doc_id}")
+        response = api_client.get(SESSIONS_URL, params={"user_id": user_id, "document_id": nonexistent_doc_id})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert len(result["sessions"]) == 0
 
     def test_list_sessions_pagination(self, api_client, chat_session):
@@ -489,14 +516,14 @@ class TestChatSessionListing:
                 "document_id": chat_session["document"]["document_id"],
                 "session_name": f"Extra Session {i}"
             }
-            api_client.post("/api/v1/chat/sessions", json=session_data)
+            api_client.post(SESSIONS_URL, json=session_data)
         
         # Test con limit
-        response = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}&limit=2")
+        response = api_client.get(SESSIONS_URL, params={"user_id": user_id, "limit": 2})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert len(result["sessions"]) <= 2
         assert result["limit"] == 2
 
@@ -505,11 +532,11 @@ class TestChatSessionListing:
         user_id = chat_session["document"]["user_data"]["user_id"]
         
         # Test con active_only=true (default)
-        response1 = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}&active_only=true")
+        response1 = api_client.get(SESSIONS_URL, params={"user_id": user_id, "active_only": "true"})
         assert response1.status_code == 200
         
         # Test con active_only=false
-        response2 = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}&active_only=false")
+        response2 = api_client.get(SESSIONS_URL, params={"user_id": user_id, "active_only": "false"})
         assert response2.status_code == 200
 
 
@@ -519,10 +546,10 @@ class TestChatSessionListingExceptions:
     @pytest.mark.edge_case
     def test_list_sessions_missing_user_id(self, api_client):
         """Test de error cuando user_id es requerido pero no se proporciona."""
-        response = api_client.get("/api/v1/chat/sessions")
+        response = api_client.get(SESSIONS_URL)
         
         assert response.status_code == 400
-        data = response.json()
+        data = rjson(response)
         
         # Check main error structure
         assert "error_code" in data
@@ -548,13 +575,13 @@ class TestChatSessionListingExceptions:
         ]
         
         for invalid_user_id in invalid_user_ids:
-            response = api_client.get(f"/api/v1/chat/sessions?user_id={invalid_user_id}")
+            response = api_client.get(SESSIONS_URL, params={"user_id": invalid_user_id})
             
             # Puede ser 400 (nuestras validaciones), 422 (FastAPI), 200 (URL encoding), o 500 (casos edge extremos)
             assert response.status_code in [200, 400, 422, 500]
             
             if response.status_code == 400:
-                data = response.json()
+                data = rjson(response)
                 
                 # Check main error structure for our custom validation
                 assert "error_code" in data
@@ -570,7 +597,7 @@ class TestChatSessionListingExceptions:
                 assert "alphanumeric" in error_details["suggestion"]
             elif response.status_code == 422:
                 # FastAPI validation
-                data = response.json()
+                data = rjson(response)
                 assert "detail" in data
             elif response.status_code == 500:
                 # Internal server error para casos edge extremos
@@ -591,10 +618,10 @@ class TestChatSessionListingExceptions:
         ]
         
         for invalid_id in invalid_document_ids:
-            response = api_client.get(f"/api/v1/chat/sessions?user_id={test_user_data['user_id']}&document_id={invalid_id}")
+            response = api_client.get(SESSIONS_URL, params={"user_id": test_user_data["user_id"], "document_id": invalid_id})
             
             assert response.status_code == 400
-            data = response.json()
+            data = rjson(response)
             
             # Check main error structure
             assert "error_code" in data
@@ -617,11 +644,11 @@ class TestChatSessionListingExceptions:
         # Test limit inválido
         invalid_limits = [0, -1, 101, 200]
         for invalid_limit in invalid_limits:
-            response = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}&limit={invalid_limit}")
+            response = api_client.get(SESSIONS_URL, params={"user_id": user_id, "limit": invalid_limit})
             
             # Puede ser 400 (nuestras validaciones) o 422 (FastAPI validation)
             assert response.status_code in [400, 422]
-            data = response.json()
+            data = rjson(response)
             
             if response.status_code == 400:
                 # Nuestras validaciones personalizadas - estructura anidada
@@ -643,11 +670,11 @@ class TestChatSessionListingExceptions:
         # Test skip inválido
         invalid_skips = [-1, -10]
         for invalid_skip in invalid_skips:
-            response = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}&skip={invalid_skip}")
+            response = api_client.get(SESSIONS_URL, params={"user_id": user_id, "skip": invalid_skip})
             
             # Puede ser 400 (nuestras validaciones) o 422 (FastAPI validation)
             assert response.status_code in [400, 422]
-            data = response.json()
+            data = rjson(response)
             
             if response.status_code == 400:
                 # Check nested error details
@@ -665,10 +692,10 @@ class TestChatSessionListingExceptions:
         document_id = chat_session["document"]["document_id"]
         
         # Test con document_id correcto
-        response = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}&document_id={document_id}")
+        response = api_client.get(SESSIONS_URL, params={"user_id": user_id, "document_id": document_id})
         
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         
         assert "sessions" in data
         sessions = data["sessions"]
@@ -682,10 +709,10 @@ class TestChatSessionListingExceptions:
         user_id = chat_session["document"]["user_data"]["user_id"]
         nonexistent_document_id = "60f7b3b8e8f4c2a1b8d3e4f5"  # ObjectId válido pero inexistente
         
-        response = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}&document_id={nonexistent_document_id}")
+        response = api_client.get(SESSIONS_URL, params={"user_id": user_id, "document_id": nonexistent_document_id})
         
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         
         assert "sessions" in data
         sessions = data["sessions"]
@@ -703,11 +730,10 @@ class TestChatSessionListingExceptions:
         ]
         
         for case in valid_cases:
-            query_params = "&".join([f"{key}={value}" for key, value in case.items()])
-            response = api_client.get(f"/api/v1/chat/sessions?{query_params}")
+            response = api_client.get(SESSIONS_URL, params=case)
             
             assert response.status_code == 200
-            data = response.json()
+            data = rjson(response)
             
             assert "sessions" in data
             assert "total_found" in data
@@ -719,10 +745,10 @@ class TestChatSessionListingExceptions:
     def test_list_sessions_error_response_structure(self, api_client):
         """Test de estructura de respuestas de error."""
         # Test sin user_id
-        response = api_client.get("/api/v1/chat/sessions")
+        response = api_client.get(SESSIONS_URL)
         
         assert response.status_code == 400
-        data = response.json()
+        data = rjson(response)
         
         # Verificar estructura principal
         main_required_fields = ["error_code", "error_message", "timestamp"]
@@ -751,28 +777,50 @@ class TestChatSessionListingExceptions:
 class TestChatQuestions:
     """Tests para hacer preguntas en chat."""
 
-    @pytest.mark.slow
-    def test_ask_question_streaming_success(self, api_client, chat_session):
-        """Test de pregunta con respuesta streaming exitosa."""
-        question_data = {
-            "session_id": chat_session["session_id"],
-            "user_id": chat_session["document"]["user_data"]["user_id"],
-            "document_id": chat_session["document"]["document_id"],
-            "question": "¿Cuál es el diagnóstico principal del paciente?"
+    @pytest.fixture
+    def live_chat_session(self, http_api_client, sample_medical_pdf_file, wait_for_processing):
+        """
+        Documento y sesión de chat creados en el servidor real, el mismo que atiende el stream.
+        Con api_client quedarían en la app en proceso (fakes de Azure y base de datos del
+        worker de xdist), que el servidor real no ve.
+        """
+        user_id = f"u_{uuid.uuid4().hex}"
+        
+        files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        upload_response = http_api_client.post(UPLOAD_URL, files=files, data={"user_id": user_id})
+        assert upload_response.status_code == 201
+        
+        document_id = upload_response.json()["document_id"]
+        wait_for_processing(http_api_client, document_id)
+        
+        session_response = http_api_client.post(SESSIONS_URL, json={
+            "user_id": user_id,
+            "document_id": document_id,
+            "session_name": "Test Chat Session"
+        })
+        assert session_response.status_code == 201
+        session_id = session_response.json()["session_id"]
+        
+        # Misma forma que chat_session para reutilizar _ask_body
+        yield {
+            "session_id": session_id,
+            "document": {"document_id": document_id, "user_data": {"user_id": user_id}}
         }
         
-        with httpx.stream("POST", f"{api_client.base_url}/api/v1/chat/ask", json=question_data) as response:
+        # Limpiar en el servidor real: session_user_registry solo limpia la base de datos de los tests
+        http_api_client.delete(SESSION_URL.format(sid=session_id), params={"user_id": user_id})
+        http_api_client.delete(DOCUMENT_URL.format(doc_id=document_id))
+
+    @pytest.mark.slow
+    def test_ask_question_streaming_success(self, http_api_client, live_chat_session):
+        """Test de pregunta con respuesta streaming exitosa (servidor real)."""
+        body = _ask_body(live_chat_session, "¿Cuál es el diagnóstico principal del paciente?")
+        
+        with http_api_client.stream("POST", ASK_URL, content=body, headers=_JSON_HEADERS) as response:
             assert response.status_code == 200
             assert response.headers.get("content-type") == "text/event-stream; charset=utf-8"
             
-            events = []
-            for line in response.iter_lines():
-                if line.startswith("data: "):
-                    try:
-                        event_data = json.loads(line[6:])  # Remove "data: "
-                        events.append(event_data)
-                    except json.JSONDecodeError:
-                        continue
+            events = list(iter_sse_events(response))
             
             # Verificar que recibimos eventos
             assert len(events) > 0
@@ -785,76 +833,66 @@ class TestChatQuestions:
 
     def test_ask_question_simple(self, api_client, chat_session):
         """Test de pregunta simple."""
-        question_data = {
-            "session_id": chat_session["session_id"],
-            "user_id": chat_session["document"]["user_data"]["user_id"],
-            "document_id": chat_session["document"]["document_id"],
-            "question": "Hola"
-        }
+        body = _ask_body(chat_session, "Hola")
         
-        response = api_client.post("/api/v1/chat/ask", json=question_data)
+        response = api_client.post(ASK_URL, content=body, headers=_JSON_HEADERS)
         
         # Debería iniciar el streaming correctamente
         assert response.status_code == 200
 
     @pytest.mark.edge_case
-    def test_ask_question_missing_fields(self, api_client, clean_database):
-        """Test de error con campos faltantes."""
-        # Sin session_id
-        response1 = api_client.post("/api/v1/chat/ask", json={
-            "user_id": "test",
-            "document_id": "test",
-            "question": "test"
-        })
-        assert response1.status_code == 422
-        
-        # Sin question
-        response2 = api_client.post("/api/v1/chat/ask", json={
+    @pytest.mark.parametrize("payload,missing_field", [
+        ({"user_id": "test", "document_id": "test", "question": "test"}, "session_id"),
+        ({"session_id": "test", "user_id": "test", "document_id": "test"}, "question"),
+    ], ids=["sin_session_id", "sin_question"])
+    def test_ask_question_missing_fields(self, payload, missing_field):
+        """Test de error con campos faltantes (validación del modelo, sin servidor)."""
+        with pytest.raises(ValidationError) as exc_info:
+            ChatQuestionData.model_validate(payload)
+        
+        missing = [error["loc"][0] for error in exc_info.value.errors() if error["type"] == "missing"]
+        assert missing == [missing_field]
+
+    @pytest.mark.edge_case
+    def test_ask_question_missing_fields_endpoint(self, api_client):
+        """Test centinela: el endpoint aplica la validación del modelo y responde 422."""
+        response = api_client.post(ASK_URL, json={
             "session_id": "test",
             "user_id": "test",
             "document_id": "test"
         })
-        assert response2.status_code == 422
+        
+        assert response.status_code == 422
 
     @pytest.mark.edge_case
-    def test_ask_question_nonexistent_session(self, api_client, clean_database, test_user_data):
+    def test_ask_question_nonexistent_session(self, api_client, unique_user_data):
         """Test de error con sesión inexistente."""
-        question_data = {
+        body = orjson.dumps({
             "session_id": "nonexistent-session-id",
-            "user_id": test_user_data["user_id"],
+            "user_id": unique_user_data["user_id"],
             "document_id": "some-document-id",
             "question": "Test question"
-        }
+        })
         
-        response = api_client.post("/api/v1/chat/ask", json=question_data)
+        response = api_client.post(ASK_URL, content=body, headers=_JSON_HEADERS)
         
         # Debería fallar debido a sesión inexistente
         assert response.status_code in [400, 500]
 
     def test_ask_question_very_short(self, api_client, chat_session):
         """Test con pregunta muy corta."""
-        question_data = {
-            "session_id": chat_session["session_id"],
-            "user_id": chat_session["document"]["user_data"]["user_id"],
-            "document_id": chat_session["document"]["document_id"],
-            "question": "¿?"
-        }
+        body = _ask_body(chat_session, "¿?")
         
-        response = api_client.post("/api/v1/chat/ask", json=question_data)
+        response = api_client.post(ASK_URL, content=body, headers=_JSON_HEADERS)
         
         assert response.status_code == 200
 
     @pytest.mark.edge_case
     def test_ask_question_too_short(self, api_client, chat_session):
         """Test con pregunta que no cumple el mínimo."""
-        question_data = {
-            "session_id": chat_session["session_id"],
-            "user_id": chat_session["document"]["user_data"]["user_id"],
-            "document_id": chat_session["document"]["document_id"],
-            "question": "a"  # Solo 1 carácter, mínimo es 3
-        }
+        body = _ask_body(chat_session, "a")  # Solo 1 carácter, mínimo es 3
         
-        response = api_client.post("/api/v1/chat/ask", json=question_data)
+        response = api_client.post(ASK_URL, content=body, headers=_JSON_HEADERS)
         
         assert response.status_code == 422
 
@@ -867,11 +905,11 @@ class TestChatSessionInfo:
         session_id = chat_session["session_id"]
         user_id = chat_session["document"]["user_data"]["user_id"]
         
-        response = api_client.get(f"/api/v1/chat/sessions/{session_id}?user_id={user_id}")
+        response = api_client.get(SESSION_URL.format(sid=session_id), params={"user_id": user_id})
         
         assert response.status_code == 200
         
-        session_info = response.json()
+        session_info = rjson(response)
         assert session_info["session_id"] == session_id
         assert session_info["user_id"] == user_id
         assert "document_id" in session_info
@@ -886,7 +924,7 @@ class TestChatSessionInfo:
         """Test de error al no proporcionar user_id."""
         session_id = chat_session["session_id"]
         
-        response = api_client.get(f"/api/v1/chat/sessions/{session_id}")
+        response = api_client.get(SESSION_URL.format(sid=session_id))
         
         assert response.status_code == 422
 
@@ -896,17 +934,17 @@ class TestChatSessionInfo:
         session_id = chat_session["session_id"]
         wrong_user_id = test_user_data["alternative_user_id"]
         
-        response = api_client.get(f"/api/v1/chat/sessions/{session_id}?user_id={wrong_user_id}")
+        response = api_client.get(SESSION_URL.format(sid=session_id), params={"user_id": wrong_user_id})
         
         assert response.status_code == 400
 
     @pytest.mark.edge_case
-    def test_get_session_info_nonexistent(self, api_client, clean_database, test_user_data):
+    def test_get_session_info_nonexistent(self, api_client, unique_user_data):
         """Test con sesión inexistente."""
         fake_session_id = "nonexistent-session-id"
-        user_id = test_user_data["user_id"]
+        user_id = unique_user_data["user_id"]
         
-        response = api_client.get(f"/api/v1/chat/sessions/{fake_session_id}?user_id={user_id}")
+        response = api_client.get(SESSION_URL.format(sid=fake_session_id), params={"user_id": user_id})
         
         assert response.status_code == 404
 
@@ -919,11 +957,11 @@ class TestChatSessionInteractions:
         session_id = chat_session["session_id"]
         user_id = chat_session["document"]["user_data"]["user_id"]
         
-        response = api_client.get(f"/api/v1/chat/sessions/{session_id}/interactions?user_id={user_id}")
+        response = api_client.get(SESSION_INTERACTIONS_URL.format(sid=session_id), params={"user_id": user_id})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert result["session_id"] == session_id
         assert result["user_id"] == user_id
         assert len(result["interactions"]) == 0
@@ -944,18 +982,18 @@ class TestChatSessionInteractions:
         }
         
         # Hacer la pregunta (esto creará una interacción)
-        ask_response = api_client.post("/api/v1/chat/ask", json=question_data)
+        ask_response = api_client.post(ASK_URL, json=question_data)
         assert ask_response.status_code == 200
         
         # Esperar un poco para que se procese
         time.sleep(2)
         
         # Obtener interacciones
-        response = api_client.get(f"/api/v1/chat/sessions/{session_id}/interactions?user_id={user_id}")
+        response = api_client.get(SESSION_INTERACTIONS_URL.format(sid=session_id), params={"user_id": user_id})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert len(result["interactions"]) > 0
         
         interaction = result["interactions"][0]
@@ -971,11 +1009,11 @@ class TestChatSessionInteractions:
         session_id = chat_session["session_id"]
         user_id = chat_session["document"]["user_data"]["user_id"]
         
-        response = api_client.get(f"/api/v1/chat/sessions/{session_id}/interactions?user_id={user_id}&limit=10&skip=0")
+        response = api_client.get(SESSION_INTERACTIONS_URL.format(sid=session_id), params={"user_id": user_id, "limit": 10, "skip": 0})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert result["limit"] == 10
         assert result["skip"] == 0
 
@@ -984,7 +1022,7 @@ class TestChatSessionInteractions:
         """Test de error al no proporcionar user_id."""
         session_id = chat_session["session_id"]
         
-        response = api_client.get(f"/api/v1/chat/sessions/{session_id}/interactions")
+        response = api_client.get(SESSION_INTERACTIONS_URL.format(sid=session_id))
         
         assert response.status_code == 422
 
@@ -997,11 +1035,11 @@ class TestChatSessionDeletion:
         session_id = chat_session["session_id"]
         user_id = chat_session["document"]["user_data"]["user_id"]
         
-        response = api_client.delete(f"/api/v1/chat/sessions/{session_id}?user_id={user_id}")
+        response = api_client.delete(SESSION_URL.format(sid=session_id), params={"user_id": user_id})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert result["session_id"] == session_id
         assert result["deleted"] is True
         assert "interactions_deleted" in result
@@ -1009,7 +1047,7 @@ class TestChatSessionDeletion:
         assert "deleted_timestamp" in result
         
         # Verificar que la sesión ya no existe
-        get_response = api_client.get(f"/api/v1/chat/sessions/{session_id}?user_id={user_id}")
+        get_response = api_client.get(SESSION_URL.format(sid=session_id), params={"user_id": user_id})
         assert get_response.status_code == 404
 
     @pytest.mark.edge_case
@@ -1017,7 +1055,7 @@ class TestChatSessionDeletion:
         """Test de error al no proporcionar user_id."""
         session_id = chat_session["session_id"]
         
-        response = api_client.delete(f"/api/v1/chat/sessions/{session_id}")
+        response = api_client.delete(SESSION_URL.format(sid=session_id))
         
         assert response.status_code == 422
 
@@ -1027,24 +1065,24 @@ class TestChatSessionDeletion:
         session_id = chat_session["session_id"]
         wrong_user_id = test_user_data["alternative_user_id"]
         
-        response = api_client.delete(f"/api/v1/chat/sessions/{session_id}?user_id={wrong_user_id}")
+        response = api_client.delete(SESSION_URL.format(sid=session_id), params={"user_id": wrong_user_id})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert result["deleted"] is False
 
     @pytest.mark.edge_case
-    def test_delete_session_nonexistent(self, api_client, clean_database, test_user_data):
+    def test_delete_session_nonexistent(self, api_client, unique_user_data):
         """Test de eliminación de sesión inexistente."""
         fake_session_id = "nonexistent-session-id"
-        user_id = test_user_data["user_id"]
+        user_id = unique_user_data["user_id"]
         
-        response = api_client.delete(f"/api/v1/chat/sessions/{fake_session_id}?user_id={user_id}")
+        response = api_client.delete(SESSION_URL.format(sid=fake_session_id), params={"user_id": user_id})
         
         assert response.status_code == 200
         
-        result = response.json()
+        result = rjson(response)
         assert result["deleted"] is False
 
 
@@ -1053,11 +1091,11 @@ class TestChatStatistics:
 
     def test_get_chat_stats_empty(self, api_client, clean_database):
         """Test de estadísticas cuando no hay datos."""
-        response = api_client.get("/api/v1/chat/stats")
+        response = api_client.get(STATS_URL)
         
         assert response.status_code == 200
         
-        stats = response.json()
+        stats = rjson(response)
         assert "period_days" in stats
         assert "total_interactions" in stats
         assert "total_questions" in stats
@@ -1066,42 +1104,43 @@ class TestChatStatistics:
         assert stats["total_questions"] == 0
         assert stats["total_responses"] == 0
 
-    def test_get_chat_stats_with_filter(self, api_client, chat_session):
-        """Test de estadísticas con filtros."""
+    @pytest.mark.asyncio
+    async def test_get_chat_stats_with_filter(self, async_api_client, chat_session):
+        """Test de estadísticas con filtros por usuario, por documento y ambos."""
         user_id = chat_session["document"]["user_data"]["user_id"]
         document_id = chat_session["document"]["document_id"]
+        filter_params = [
+            {"user_id": user_id},
+            {"document_id": document_id},
+            {"user_id": user_id, "document_id": document_id},
+        ]
         
-        # Test con filtro por usuario
-        response1 = api_client.get(f"/api/v1/chat/stats?user_id={user_id}")
-        assert response1.status_code == 200
-        
-        # Test con filtro por documento
-        response2 = api_client.get(f"/api/v1/chat/stats?document_id={document_id}")
-        assert response2.status_code == 200
+        # Una sola sesión de chat para las tres combinaciones de filtros
+        responses = await asyncio.gather(*[
+            async_api_client.get(STATS_URL, params=params) for params in filter_params
+        ])
         
-        # Test con ambos filtros
-        response3 = api_client.get(f"/api/v1/chat/stats?user_id={user_id}&document_id={document_id}")
-        assert response3.status_code == 200
+        assert [response.status_code for response in responses] == [200] * len(filter_params)
 
-    def test_get_chat_stats_custom_period(self, api_client, clean_database):
+    def test_get_chat_stats_custom_period(self, api_client):
         """Test de estadísticas con período personalizado."""
-        response = api_client.get("/api/v1/chat/stats?days=7")
+        response = api_client.get(STATS_URL, params={"days": 7})
         
         assert response.status_code == 200
         
-        stats = response.json()
+        stats = rjson(response)
         assert stats["period_days"] == 7
 
     @pytest.mark.edge_case
-    def test_get_chat_stats_invalid_period(self, api_client, clean_database):
+    @pytest.mark.parametrize("days", [
+        -1,   # Días negativos
+        400,  # Días que exceden el máximo
+    ], ids=["negativo", "excede_maximo"])
+    def test_get_chat_stats_invalid_period(self, api_client, days):
         """Test con período inválido."""
-        # Días negativos
-        response1 = api_client.get("/api/v1/chat/stats?days=-1")
-        assert response1.status_code == 422
+        response = api_client.get(STATS_URL, params={"days": days})
         
-        # Días que exceden el máximo
-        response2 = api_client.get("/api/v1/chat/stats?days=400")
-        assert response2.status_code == 422
+        assert response.status_code == 422
 
 
 class TestChatWorkflow:
@@ -1120,9 +1159,9 @@ class TestChatWorkflow:
             "session_name": "Complete Workflow Test"
         }
         
-        create_response = api_client.post("/api/v1/chat/sessions", json=session_data)
+        create_response = api_client.post(SESSIONS_URL, json=session_data)
         assert create_response.status_code == 201
-        session_id = create_response.json()["session_id"]
+        session_id = rjson(create_response)["session_id"]
         
         # 2. Hacer una pregunta
         question_data = {
@@ -1132,31 +1171,31 @@ class TestChatWorkflow:
             "question": "¿Qué información contiene este documento?"
         }
         
-        ask_response = api_client.post("/api/v1/chat/ask", json=question_data)
+        ask_response = api_client.post(ASK_URL, json=question_data)
         assert ask_response.status_code == 200
         
         # Esperar procesamiento
         time.sleep(3)
         
         # 3. Verificar que la sesión tiene interacciones
-        interactions_response = api_client.get(f"/api/v1/chat/sessions/{session_id}/interactions?user_id={user_id}")
+        interactions_response = api_client.get(SESSION_INTERACTIONS_URL.format(sid=session_id), params={"user_id": user_id})
         assert interactions_response.status_code == 200
-        interactions = interactions_response.json()["interactions"]
+        interactions = rjson(interactions_response)["interactions"]
         assert len(interactions) > 0
         
         # 4. Obtener información de la sesión
-        info_response = api_client.get(f"/api/v1/chat/sessions/{session_id}?user_id={user_id}")
+        info_response = api_client.get(SESSION_URL.format(sid=session_id), params={"user_id": user_id})
         assert info_response.status_code == 200
-        session_info = info_response.json()
+        session_info = rjson(info_response)
         assert session_info["interaction_count"] > 0
         
         # 5. Eliminar sesión
-        delete_response = api_client.delete(f"/api/v1/chat/sessions/{session_id}?user_id={user_id}")
+        delete_response = api_client.delete(SESSION_URL.format(sid=session_id), params={"user_id": user_id})
         assert delete_response.status_code == 200
-        assert delete_response.json()["deleted"] is True
+        assert rjson(delete_response)["deleted"] is True
         
         # 6. Verificar eliminación
-        final_info_response = api_client.get(f"/api/v1/chat/sessions/{session_id}?user_id={user_id}")
+        final_info_response = api_client.get(SESSION_URL.format(sid=session_id), params={"user_id": user_id})
         assert final_info_response.status_code == 404
 
     def test_multiple_sessions_same_document(self, api_client, uploaded_document):
@@ -1173,14 +1212,14 @@ class TestChatWorkflow:
                 "session_name": f"Session {i+1}"
             }
             
-            response = api_client.post("/api/v1/chat/sessions", json=session_data)
+            response = api_client.post(SESSIONS_URL, json=session_data)
             assert response.status_code == 201
-            session_ids.append(response.json()["session_id"])
+            session_ids.append(rjson(response)["session_id"])
         
         # Verificar que todas las sesiones existen
-        list_response = api_client.get(f"/api/v1/chat/sessions?user_id={user_id}")
+        list_response = api_client.get(SESSIONS_URL, params={"user_id": user_id})
         assert list_response.status_code == 200
-        sessions = list_response.json()["sessions"]
+        sessions = rjson(list_response)["sessions"]
         assert len(sessions) == 3
         
         # Verificar que todas pertenecen al mismo documento
@@ -1200,16 +1239,16 @@ class TestChatWorkflow:
             "session_name": "User 1 Session"
         }
         
-        response1 = api_client.post("/api/v1/chat/sessions", json=session_data_1)
+        response1 = api_client.post(SESSIONS_URL, json=session_data_1)
         assert response1.status_code == 201
-        session1_id = response1.json()["session_id"]
+        session1_id = rjson(response1)["session_id"]
         
         # Usuario 2 no debería ver la sesión de usuario 1
-        list_response = api_client.get(f"/api/v1/chat/sessions?user_id={user2_id}")
+        list_response = api_client.get(SESSIONS_URL, params={"user_id": user2_id})
         assert list_response.status_code == 200
-        user2_sessions = list_response.json()["sessions"]
+        user2_sessions = rjson(list_response)["sessions"]
         assert len(user2_sessions) == 0
         
         # Usuario 2 no debería poder acceder a la sesión de usuario 1
-        access_response = api_client.get(f"/api/v1/chat/sessions/{session1_id}?user_id={user2_id}")
+        access_response = api_client.get(SESSION_URL.format(sid=session1_id), params={"user_id": user2_id})
         assert access_response.status_code == 400 
\ No newline at end of file
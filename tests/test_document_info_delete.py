@@ -0,0 +1,253 @@
+"""
+Tests para información y eliminación de documentos por ID.
+"""
+
+import pytest
+import re
+import string
+
+from hypothesis import given, settings, strategies as st
+
+from tests.utils import TestAssertions
+
+
+DOCUMENTS_URL = "/api/v1/documents/"
+DOCUMENT_URL = "/api/v1/documents/{doc_id}"
+
+# Campos que siempre trae error_message en los errores de documentos
+_NOT_FOUND_FIELDS = frozenset({"message", "request_id", "document_id", "suggestion"})
+_INVALID_ID_FIELDS = frozenset({"message", "request_id", "provided_id", "expected_format"})
+_DELETE_INVALID_ID_FIELDS = _INVALID_ID_FIELDS | {"suggestion"}
+
+# IDs seguros en la URL que nunca cumplen el formato ObjectId (24 hex en minúsculas)
+_OBJECT_ID_RE = re.compile(r"^[a-f0-9]{24}$")
+_INVALID_DOCUMENT_IDS = st.text(
+    alphabet=string.ascii_letters + string.digits + "-_", min_size=1, max_size=48
+).filter(lambda value: not _OBJECT_ID_RE.match(value))
+
+# Casos fijos de IDs inválidos, con ids estables para seleccionarlos con -k
+_INVALID_ID_CASES = [
+    pytest.param("123", id="too_short"),
+    pytest.param("507f1f77bcf86cd799439011x", id="bad_char"),
+    pytest.param("507f1f77bcf86cd79943901", id="short_by_one"),
+    pytest.param("invalid-id-with-dashes", id="dashes"),
+    pytest.param("507f1f77bcf86cd799439011507f1f77bcf86cd799439011", id="too_long"),
+]
+
+
+class TestDocumentInfo:
+    """Tests para obtener información de documentos."""
+
+    @pytest.mark.edge_case
+    def test_get_document_info_nonexistent(self, api_client):
+        """Test de información de documento que no existe."""
+        fake_id = "60f7b3b8e8f4c2a1b8d3e4f5"  # ObjectId válido pero inexistente
+        
+        response = api_client.get(DOCUMENT_URL.format(doc_id=fake_id))
+        
+        TestAssertions.assert_error_response(
+            response, 404, "DOCUMENT_NOT_FOUND", _NOT_FOUND_FIELDS, document_id=fake_id
+        )
+
+    @pytest.mark.edge_case
+    def test_get_document_info_invalid_id(self, api_client):
+        """Test con ID de documento inválido."""
+        invalid_id = "invalid_id_format"
+        
+        response = api_client.get(DOCUMENT_URL.format(doc_id=invalid_id))
+        
+        TestAssertions.assert_error_response(
+            response, 400, "INVALID_DOCUMENT_ID_FORMAT", _INVALID_ID_FIELDS, provided_id=invalid_id
+        )
+
+    @pytest.mark.edge_case
+    @pytest.mark.parametrize("invalid_id", _INVALID_ID_CASES)
+    def test_get_document_info_invalid_id_formats(self, api_client, invalid_id):
+        """Test con diferentes formatos de ID inválidos."""
+        response = api_client.get(DOCUMENT_URL.format(doc_id=invalid_id))
+        
+        TestAssertions.assert_error_response(
+            response, 400, "INVALID_DOCUMENT_ID_FORMAT", _INVALID_ID_FIELDS, provided_id=invalid_id
+        )
+
+    @pytest.mark.edge_case
+    @settings(max_examples=20, deadline=None)
+    @given(invalid_id=_INVALID_DOCUMENT_IDS)
+    def test_get_document_info_invalid_id_generated(self, api_client, invalid_id):
+        """Test con IDs inválidos generados por hypothesis."""
+        response = api_client.get(DOCUMENT_URL.format(doc_id=invalid_id))
+        
+        TestAssertions.assert_error_response(
+            response, 400, "INVALID_DOCUMENT_ID_FORMAT", _INVALID_ID_FIELDS, provided_id=invalid_id
+        )
+
+    @pytest.mark.edge_case
+    def test_get_document_info_empty_id(self, api_client):
+        """Test con ID vacío."""
+        response = api_client.get(DOCUMENT_URL.format(doc_id=""))
+        
+        # Caso especial: ID vacío resuelve al endpoint de listado, que exige user_id
+        assert response.status_code == 400
+        assert response.json()["error_code"] == "USER_ID_REQUIRED"
+
+    @pytest.mark.edge_case
+    @pytest.mark.parametrize("fake_id", [
+        "507f1f77bcf86cd799439011",
+        "60f7b3b8e8f4c2a1b8d3e4f5",
+        "61f7b3b8e8f4c2a1b8d3e4f6",
+    ])
+    def test_get_document_info_valid_objectid_nonexistent(self, api_client, fake_id):
+        """Test con ObjectId válido que no existe en la base de datos."""
+        response = api_client.get(DOCUMENT_URL.format(doc_id=fake_id))
+        
+        error_message = TestAssertions.assert_error_response(
+            response, 404, "DOCUMENT_NOT_FOUND", _NOT_FOUND_FIELDS, document_id=fake_id
+        )
+        assert "document" in error_message["suggestion"].lower()  # Cambio: buscar "document" en lugar de "documents"
+
+    @pytest.mark.edge_case
+    def test_get_document_info_error_response_structure(self, api_client):
+        """Test que las respuestas de error tienen estructura consistente."""
+        # Test con ID inválido
+        response = api_client.get(DOCUMENT_URL.format(doc_id="invalid"))
+        
+        # Campos obligatorios en el nivel superior y en error_message
+        error_message = TestAssertions.assert_error_response(
+            response, 400, "INVALID_DOCUMENT_ID_FORMAT", _INVALID_ID_FIELDS
+        )
+        
+        # Verificar que request_id tiene formato correcto
+        TestAssertions.assert_request_id(error_message["request_id"], "get_doc_")
+
+    @pytest.mark.edge_case
+    def test_get_document_info_case_sensitivity(self, api_client):
+        """Test de sensibilidad a mayúsculas/minúsculas en ObjectId."""
+        # ObjectId válido en mayúsculas
+        uppercase_id = "507F1F77BCF86CD799439011"
+        
+        response = api_client.get(DOCUMENT_URL.format(doc_id=uppercase_id))
+        
+        # El validador actual rechaza mayúsculas como formato inválido
+        TestAssertions.assert_error_response(
+            response, 400, "INVALID_DOCUMENT_ID_FORMAT", provided_id=uppercase_id
+        )
+
+
+class TestDocumentDeletion:
+    """Tests para eliminación de documentos."""
+
+    def test_delete_document_success(self, api_client, inserted_document):
+        """Test de eliminación exitosa de documento."""
+        document_id = inserted_document["document_id"]
+        
+        response = api_client.delete(DOCUMENT_URL.format(doc_id=document_id))
+        
+        assert response.status_code == 200
+        
+        result = response.json()
+        assert result["document_id"] == document_id
+        assert result["success"] is True
+        assert "message" in result
+        
+        # Verificar que el documento ya no existe
+        get_response = api_client.get(DOCUMENT_URL.format(doc_id=document_id))
+        assert get_response.status_code == 404
+
+    @pytest.mark.edge_case
+    def test_delete_document_nonexistent(self, api_client, clean_database):
+        """Test de eliminación de documento que no existe."""
+        fake_id = "60f7b3b8e8f4c2a1b8d3e4f5"  # ObjectId válido pero inexistente
+        
+        response = api_client.delete(DOCUMENT_URL.format(doc_id=fake_id))
+        
+        TestAssertions.assert_error_response(
+            response, 404, "DOCUMENT_NOT_FOUND", _NOT_FOUND_FIELDS,
+            document_id=fake_id,
+            message=f"Document with ID '{fake_id}' does not exist or has already been deleted"
+        )
+
+    @pytest.mark.edge_case
+    def test_delete_document_invalid_id(self, api_client):
+        """Test de eliminación con ID inválido."""
+        invalid_id = "invalid_id_format"
+        
+        response = api_client.delete(DOCUMENT_URL.format(doc_id=invalid_id))
+        
+        TestAssertions.assert_error_response(
+            response, 400, "INVALID_DOCUMENT_ID_FORMAT", _DELETE_INVALID_ID_FIELDS,
+            provided_id=invalid_id,
+            expected_format="24 hexadecimal characters (MongoDB ObjectId)"
+        )
+
+    @pytest.mark.edge_case
+    @pytest.mark.parametrize("invalid_id", _INVALID_ID_CASES)
+    def test_delete_document_invalid_id_formats(self, api_client, invalid_id):
+        """Test de eliminación con diferentes formatos de ID inválidos."""
+        response = api_client.delete(DOCUMENT_URL.format(doc_id=invalid_id))
+        
+        TestAssertions.assert_error_response(
+            response, 400, "INVALID_DOCUMENT_ID_FORMAT", _INVALID_ID_FIELDS, provided_id=invalid_id
+        )
+
+    @pytest.mark.edge_case
+    @settings(max_examples=20, deadline=None)
+    @given(invalid_id=_INVALID_DOCUMENT_IDS)
+    def test_delete_document_invalid_id_generated(self, api_client, invalid_id):
+        """Test de eliminación con IDs inválidos generados por hypothesis."""
+        response = api_client.delete(DOCUMENT_URL.format(doc_id=invalid_id))
+        
+        TestAssertions.assert_error_response(
+            response, 400, "INVALID_DOCUMENT_ID_FORMAT", _INVALID_ID_FIELDS, provided_id=invalid_id
+        )
+
+    @pytest.mark.edge_case
+    def test_delete_document_empty_id(self, api_client):
+        """Test de eliminación con ID vacío."""
+        response = api_client.delete(DOCUMENTS_URL)
+        
+        # ID vacío redirige al endpoint de listado, no al de eliminación
+        assert response.status_code == 405  # Method Not Allowed para DELETE en endpoint de listado
+
+    def test_delete_document_twice(self, api_client, inserted_document):
+        """Test de eliminación del mismo documento dos veces."""
+        document_id = inserted_document["document_id"]
+        
+        # Primera eliminación
+        response1 = api_client.delete(DOCUMENT_URL.format(doc_id=document_id))
+        assert response1.status_code == 200
+        assert response1.json()["success"] is True
+        
+        # Segunda eliminación - ahora devuelve 404
+        response2 = api_client.delete(DOCUMENT_URL.format(doc_id=document_id))
+        TestAssertions.assert_error_response(
+            response2, 404, "DOCUMENT_NOT_FOUND", document_id=document_id
+        )
+
+    @pytest.mark.edge_case
+    def test_delete_document_error_response_structure(self, api_client):
+        """Test que las respuestas de error tienen estructura consistente."""
+        # Test con ID inválido
+        response = api_client.delete(DOCUMENT_URL.format(doc_id="invalid"))
+        
+        # Campos obligatorios en el nivel superior y en error_message
+        error_message = TestAssertions.assert_error_response(
+            response, 400, "INVALID_DOCUMENT_ID_FORMAT", _DELETE_INVALID_ID_FIELDS
+        )
+        
+        # Verificar que request_id tiene formato correcto
+        TestAssertions.assert_request_id(error_message["request_id"], "del_doc_")
+
+    @pytest.mark.edge_case
+    @pytest.mark.parametrize("uppercase_id", [
+        "507F1F77BCF86CD799439011",  # Todo en mayúsculas
+        "507f1F77bcF86cd799439011",  # Mayúsculas y minúsculas mezcladas
+        "507f1f77bcf8ABCDEF123456",  # Sufijo en mayúsculas
+    ], ids=["mayusculas", "mixto", "sufijo_mayusculas"])
+    def test_delete_document_case_sensitivity(self, api_client, uppercase_id):
+        """Test de sensibilidad a mayúsculas/minúsculas en ObjectId."""
+        response = api_client.delete(DOCUMENT_URL.format(doc_id=uppercase_id))
+        
+        # El validador actual rechaza mayúsculas como formato inválido
+        TestAssertions.assert_error_response(
+            response, 400, "INVALID_DOCUMENT_ID_FORMAT", provided_id=uppercase_id
+        )
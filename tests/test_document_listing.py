@@ -0,0 +1,185 @@
+"""
+Tests para listado de documentos y lecturas sobre un documento subido compartido.
+"""
+
+import pytest
+
+from tests.utils import TestAssertions
+
+
+DOCUMENTS_URL = "/api/v1/documents/"
+DOCUMENT_URL = "/api/v1/documents/{doc_id}"
+
+# Metadatos de paginación de un listado sin resultados
+_EMPTY_PAGE = {
+    "total_found": 0, "returned_count": 0, "has_next": False, "has_prev": False,
+    "current_page": 1, "total_pages": 1
+}
+
+# batch_id con formato UUID válido que no corresponde a ningún lote
+_VALID_BATCH_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+# Tipos JSON de los campos principales del listado
+_LIST_FIELD_TYPES = {
+    "documents": list,
+    "total_found": int,
+    "has_next": bool,
+    "has_prev": bool,
+    "applied_filters": dict,
+    "request_id": str,
+    "search_timestamp": str
+}
+
+
+class TestDocumentListing:
+    """Tests para listado de documentos."""
+
+    @pytest.mark.parametrize("extra_params,expected", [
+        ({}, _EMPTY_PAGE),
+        ({"batch_id": _VALID_BATCH_ID}, {}),
+        pytest.param({"limit": 10, "skip": 0}, {"limit": 10, "skip": 0, **_EMPTY_PAGE}, marks=pytest.mark.edge_case),
+        pytest.param({"skip": 1000, "limit": 10}, {"total_found": 0, "returned_count": 0}, marks=pytest.mark.edge_case),
+        pytest.param(
+            {"batch_id": _VALID_BATCH_ID, "limit": 5, "skip": 0}, {"limit": 5, "skip": 0},
+            marks=pytest.mark.edge_case
+        ),
+    ], ids=["sin_documentos", "batch_id_uuid", "paginacion", "skip_alto", "filtros_multiples"])
+    def test_list_documents_empty_page(self, api_client, unique_user_data, extra_params, expected):
+        """Test de listado para un usuario sin documentos con distintos filtros y paginación."""
+        user_id = unique_user_data["user_id"]
+        response = api_client.get(DOCUMENTS_URL, params={"user_id": user_id, **extra_params})
+        
+        assert response.status_code == 200
+        
+        result = response.json()
+        assert result["documents"] == []
+        
+        # Verificar estructura, tipos y metadatos de paginación esperados
+        assert {field: type(result.get(field)) for field in _LIST_FIELD_TYPES} == _LIST_FIELD_TYPES
+        assert expected.items() <= result.items()
+        TestAssertions.assert_request_id(result["request_id"], "list_docs_")
+        
+        # Verificar filtros aplicados
+        applied_filters = {"user_id": user_id}
+        if "batch_id" in extra_params:
+            applied_filters["batch_id"] = extra_params["batch_id"]
+        assert applied_filters.items() <= result["applied_filters"].items()
+
+    @pytest.mark.edge_case
+    def test_list_documents_invalid_batch_id_format(self, api_client):
+        """Test con formato de batch_id inválido."""
+        invalid_batch_id = "invalid-uuid-format"
+        response = api_client.get(DOCUMENTS_URL, params={"user_id": "test_user", "batch_id": invalid_batch_id})
+        
+        # El validador de DocumentSearchParams rechaza el batch_id con un 422 en JSON
+        error_message = TestAssertions.assert_error_response(
+            response, 422, "VALIDATION_ERROR", frozenset({"message", "request_id", "suggestion"})
+        )
+        assert "batch_id" in error_message["message"]
+
+    @pytest.mark.edge_case
+    def test_list_documents_empty_user_id_filter(self, api_client):
+        """Test con user_id vacío."""
+        response = api_client.get(DOCUMENTS_URL, params={"user_id": ""})
+        
+        # El endpoint correctamente rechaza user_id vacío con 400
+        assert response.status_code == 400
+        
+        result = response.json()
+        assert "error_code" in result
+
+
+@pytest.mark.xdist_group("document_listing")
+class TestDocumentListingWithDocument:
+    """Tests de solo lectura (listado e información) que comparten un único documento subido."""
+
+    def test_list_documents_with_documents(self, api_client, shared_uploaded_document):
+        """Test de listado con documentos existentes."""
+        user_id = shared_uploaded_document["user_id"]
+        
+        response = api_client.get(DOCUMENTS_URL, params={"user_id": user_id})
+        
+        assert response.status_code == 200
+        
+        result = response.json()
+        assert "documents" in result
+        documents = result["documents"]
+        assert isinstance(documents, list)
+        assert len(documents) == 1
+        
+        # Verificar que encontramos el documento correcto
+        assert documents[0]["document_id"] == shared_uploaded_document["document_id"]
+        
+        # Verificar información del documento
+        doc = documents[0]
+        assert doc["document_id"] == shared_uploaded_document["document_id"]
+        assert "filename" in doc
+        assert "processing_status" in doc
+        assert "created_at" in doc
+        
+        # Verificar metadata de paginación
+        assert {
+            "total_found": 1, "returned_count": 1, "has_next": False, "has_prev": False,
+            "current_page": 1
+        }.items() <= result.items()
+
+    def test_list_documents_filter_by_user(self, api_client, shared_uploaded_document):
+        """Test de filtrado por usuario."""
+        user_id = shared_uploaded_document["user_id"]
+        
+        response = api_client.get(DOCUMENTS_URL, params={"user_id": user_id})
+        
+        assert response.status_code == 200
+        
+        result = response.json()
+        documents = result["documents"]
+        assert len(documents) == 1
+        assert documents[0]["user_id"] == user_id
+        
+        # Verificar filtros aplicados
+        assert result["applied_filters"]["user_id"] == user_id
+
+    def test_list_documents_filter_nonexistent_user(self, api_client, shared_uploaded_document):
+        """Test de filtrado por usuario que no existe."""
+        response = api_client.get(DOCUMENTS_URL, params={"user_id": "nonexistent_user"})
+        
+        assert response.status_code == 200
+        
+        result = response.json()
+        documents = result["documents"]
+        assert len(documents) == 0
+        assert result["total_found"] == 0
+        
+        # Verificar filtros aplicados
+        assert result["applied_filters"]["user_id"] == "nonexistent_user"
+
+    def test_list_documents_with_limit(self, api_client, shared_uploaded_document):
+        """Test de listado con límite específico."""
+        response = api_client.get(DOCUMENTS_URL, params={
+            "user_id": shared_uploaded_document["user_id"],
+            "limit": 5
+        })
+        
+        assert response.status_code == 200
+        
+        result = response.json()
+        assert result["limit"] == 5
+        
+        # El documento del usuario cabe dentro del límite
+        document_ids = [doc["document_id"] for doc in result["documents"]]
+        assert shared_uploaded_document["document_id"] in document_ids
+
+    def test_get_document_info_success(self, api_client, shared_uploaded_document):
+        """Test de obtención exitosa de información de documento."""
+        document_id = shared_uploaded_document["document_id"]
+        
+        response = api_client.get(DOCUMENT_URL.format(doc_id=document_id))
+        
+        assert response.status_code == 200
+        
+        doc_info = response.json()
+        assert doc_info["document_id"] == document_id
+        assert {
+            "filename", "content_type", "file_size", "extracted_text",
+            "processing_status", "storage_info", "created_at", "updated_at"
+        } <= doc_info.keys()
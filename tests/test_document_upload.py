@@ -0,0 +1,203 @@
+"""
+Tests para upload individual y en lote de documentos.
+"""
+
+import pytest
+import asyncio
+import io
+import json
+from typing import Dict, Any
+
+
+DOCUMENTS_URL = "/api/v1/documents/"
+UPLOAD_URL = "/api/v1/documents/upload"
+BATCH_UPLOAD_URL = "/api/v1/documents/upload/batch"
+
+# Tags serializados una sola vez como el array JSON que espera el endpoint de upload
+_UPLOAD_TAGS_JSON = json.dumps(["urgente", "cardiologia", "consulta"])
+_VARIANT_TAGS_JSON = json.dumps(["urgente", "cardiologia"])
+
+# Nombre médico válido de otro paciente, además del de sample_pdf_file
+_BATCH_SECOND_FILENAME = "4000123457_LOPEZ MARTINEZ, JOSE_6001467011_EMER.pdf"
+
+# Información médica que la API extrae del nombre de sample_pdf_file
+_SAMPLE_MEDICAL_INFO = {
+    "expediente": "4000123456",
+    "nombre_paciente": "GARCIA LOPEZ, MARIA",
+    "numero_episodio": "6001467010",
+    "categoria": "CONS"
+}
+
+
+def _assert_upload_accepted(result: Dict[str, Any], filename: str, medical_info: Dict[str, str]) -> None:
+    """Verificar la respuesta de un upload aceptado y la información médica extraída."""
+    assert "document_id" in result
+    assert result["filename"] == filename
+    # La API no devuelve user_id, description, ni tags en la respuesta
+    assert medical_info.items() <= result.items()
+    assert result["medical_info_valid"] is True
+    assert result["processing_status"] in ["processing", "completed"]
+
+
+class TestDocumentUpload:
+    """Tests para upload de documentos individuales."""
+
+    def test_upload_document_success(self, api_client, clean_database, sample_medical_pdf_file):
+        """Test de subida exitosa de documento con datos completos."""
+        file_data = sample_medical_pdf_file
+        
+        files = {"file": (file_data["filename"], io.BytesIO(file_data["bytes"]), "application/pdf")}
+        data = {
+            "user_id": "test_user_123",
+            "description": "Expediente médico de prueba",
+            "tags": _UPLOAD_TAGS_JSON
+        }
+        
+        response = api_client.post(UPLOAD_URL, files=files, data=data)
+        
+        assert response.status_code == 201
+        
+        result = response.json()
+        assert {"processing_id", "storage_info"} <= result.keys()
+        _assert_upload_accepted(
+            result, file_data["filename"], {field: file_data[field] for field in _SAMPLE_MEDICAL_INFO}
+        )
+
+    @pytest.mark.parametrize("data,should_succeed", [
+        (None, True),  # Solo archivo
+        ({"user_id": "test_user", "tags": _VARIANT_TAGS_JSON}, True),
+        ({"user_id": "test_user", "description": "A" * 500}, True),  # 500 caracteres
+        pytest.param(
+            {"user_id": "test_user", "description": "A" * 2000},  # 2000 caracteres, demasiado largo
+            False,
+            marks=pytest.mark.edge_case
+        ),
+    ], ids=["datos_minimos", "con_tags", "descripcion_larga", "descripcion_demasiado_larga"])
+    def test_upload_document_variants(self, api_client, clean_database, sample_pdf_file, data, should_succeed):
+        """Test de subida de documento con distintas combinaciones de datos opcionales."""
+        medical_filename = sample_pdf_file["filename"]
+        
+        files = {"file": (medical_filename, io.BytesIO(sample_pdf_file["bytes"]), "application/pdf")}
+        
+        response = api_client.post(UPLOAD_URL, files=files, data=data)
+        
+        if not should_succeed:
+            # Debe fallar o truncar la descripción, dependiendo de la validación
+            assert response.status_code >= 400
+            return
+        
+        assert response.status_code == 201
+        
+        _assert_upload_accepted(response.json(), medical_filename, _SAMPLE_MEDICAL_INFO)
+
+    @pytest.mark.edge_case
+    def test_upload_document_invalid_file_type(self, api_client):
+        """Test de error con tipo de archivo inválido."""
+        files = {"file": ("test.txt", io.BytesIO(b"This is a text file, not a PDF"), "text/plain")}
+        
+        response = api_client.post(UPLOAD_URL, files=files)
+        
+        # El nombre se valida antes de cualquier acceso a storage u OCR
+        assert response.status_code == 400
+        assert response.json()["error_message"]["error_code"] == "INVALID_MEDICAL_FILENAME"
+
+
+class TestDocumentBatchUpload:
+    """Tests para upload en lote de documentos."""
+
+    def test_batch_upload_success(self, api_client, clean_database, sample_pdf_file):
+        """Test de subida exitosa de múltiples documentos."""
+        medical_filename = sample_pdf_file["filename"]
+        
+        # Usar nombres médicos válidos diferentes
+        files = [
+            ("files", (medical_filename, io.BytesIO(sample_pdf_file["bytes"]), "application/pdf")),
+            ("files", (_BATCH_SECOND_FILENAME, io.BytesIO(sample_pdf_file["bytes"]), "application/pdf"))
+        ]
+        data = {
+            "user_id": "test_user",
+            "batch_description": "Lote de documentos médicos"
+        }
+        
+        response = api_client.post(BATCH_UPLOAD_URL, files=files, data=data)
+        
+        assert response.status_code == 201
+        
+        result = response.json()
+        assert {
+            "batch_id", "successful_documents", "total_files",
+            "processed_count", "failed_count", "processing_status"
+        } <= result.keys()
+        # La API devuelve "successful_documents" no "documents"
+        assert len(result["successful_documents"]) == 2
+        assert result["total_files"] == 2
+        assert result["processed_count"] == 2
+        assert result["failed_count"] == 0
+        assert result["processing_status"] in ["processing", "completed"]
+
+    def test_batch_upload_minimal(self, api_client, clean_database, sample_pdf_file):
+        """Test de subida de lote con datos mínimos."""
+        medical_filename = sample_pdf_file["filename"]
+        
+        files = [("files", (medical_filename, io.BytesIO(sample_pdf_file["bytes"]), "application/pdf"))]
+        
+        response = api_client.post(BATCH_UPLOAD_URL, files=files)
+        
+        assert response.status_code == 201
+        
+        result = response.json()
+        assert "batch_id" in result
+        # La API devuelve "successful_documents" no "documents"
+        assert len(result["successful_documents"]) == 1
+        assert result["total_files"] == 1
+        assert result["processed_count"] == 1
+        assert result["failed_count"] == 0
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_batch_upload_multiple_individual(self, async_api_client, unique_user_data, sample_pdf_file):
+        """
+        Test de varias subidas individuales del mismo usuario.
+        Cada subida recibe su propio document_id y ninguna se pierde (no usa /upload/batch).
+        """
+        user_id = unique_user_data["user_id"]
+        filenames = [f"400012345{i}_GARCIA LOPEZ, MARIA_600146701{i}_CONS.pdf" for i in range(4)]
+        
+        # El endpoint procesa de forma síncrona, así que las subidas se atienden una tras
+        # otra; gather solo evita escribir el bucle de requests
+        responses = await asyncio.gather(*[
+            async_api_client.post(
+                UPLOAD_URL,
+                files={"file": (filename, io.BytesIO(sample_pdf_file["bytes"]), "application/pdf")},
+                data={"user_id": user_id}
+            )
+            for filename in filenames
+        ])
+        
+        assert [response.status_code for response in responses] == [201] * len(filenames)
+        document_ids = {response.json()["document_id"] for response in responses}
+        assert len(document_ids) == len(filenames)
+        
+        listing_response = await async_api_client.get(DOCUMENTS_URL, params={"user_id": user_id})
+        assert listing_response.status_code == 200
+        assert listing_response.json()["total_found"] == len(filenames)
+
+    def test_batch_upload_mixed_success_failure(self, api_client, clean_database, sample_pdf_file):
+        """Test de subida de lote con archivos mixtos (válidos e inválidos)."""
+        medical_filename = sample_pdf_file["filename"]
+        
+        # Un archivo válido y uno inválido (sin formato médico); el inválido se rechaza
+        # por el nombre, así que su contenido puede ser un PDF mínimo en línea
+        files = [
+            ("files", (medical_filename, sample_pdf_file["bytes"], "application/pdf")),
+            ("files", ("archivo_invalido.pdf", b"%PDF-1.4\n%%EOF", "application/pdf"))
+        ]
+        
+        response = api_client.post(BATCH_UPLOAD_URL, files=files)
+        
+        # Con validación estricta, toda la batch debe fallar si un archivo es inválido
+        assert response.status_code == 400
+        
+        result = response.json()
+        assert "error_code" in result
+        assert "INVALID_MEDICAL_FILENAME" in str(result)
@@ -3,7 +3,7 @@ Tests para endpoints de health check y verificación del servidor.
 """
 
 import pytest
-import time
+import asyncio
 
 
 class TestHealthEndpoints:
@@ -43,31 +43,31 @@ class TestHealthEndpoints:
         assert data["environment"] in ["development", "production"]
         assert isinstance(data["timestamp"], (int, float))
 
-    def test_health_check_timing(self, api_client, server_health_check):
+    @pytest.mark.benchmark(group="health", min_rounds=20, max_time=1.0)
+    def test_health_check_timing(self, api_client, server_health_check, benchmark):
         """Test que el health check responde rápidamente."""
-        start_time = time.time()
-        response = api_client.get("/health")
-        end_time = time.time()
+        response = benchmark(api_client.get, "/health")
         
         assert response.status_code == 200
-        assert (end_time - start_time) < 1.0  # Debería responder en menos de 1 segundo
+        # Sin estadísticas cuando el benchmark está desactivado (p. ej. con xdist)
+        if benchmark.stats is not None:
+            assert benchmark.stats.stats.mean < 1.0  # Debería responder en menos de 1 segundo
 
-    def test_root_endpoint_timing(self, api_client, server_health_check):
+    @pytest.mark.benchmark(group="health", min_rounds=20, max_time=1.0)
+    def test_root_endpoint_timing(self, api_client, server_health_check, benchmark):
         """Test que el endpoint raíz responde rápidamente."""
-        start_time = time.time()
-        response = api_client.get("/")
-        end_time = time.time()
+        response = benchmark(api_client.get, "/")
         
         assert response.status_code == 200
-        assert (end_time - start_time) < 1.0  # Debería responder en menos de 1 segundo
+        # Sin estadísticas cuando el benchmark está desactivado (p. ej. con xdist)
+        if benchmark.stats is not None:
+            assert benchmark.stats.stats.mean < 1.0  # Debería responder en menos de 1 segundo
 
-    def test_multiple_health_checks(self, api_client, server_health_check):
-        """Test de múltiples health checks consecutivos."""
-        responses = []
-        
-        for _ in range(5):
-            response = api_client.get("/health")
-            responses.append(response)
+    @pytest.mark.asyncio
+    async def test_multiple_health_checks(self, async_api_client, server_health_check):
+        """Test de múltiples health checks simultáneos."""
+        # Los requests se solapan en el event loop en lugar de esperar uno tras otro
+        responses = await asyncio.gather(*[async_api_client.get("/health") for _ in range(5)])
         
         # Todos deberían ser exitosos
         for response in responses:
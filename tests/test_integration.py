@@ -4,11 +4,15 @@ Estos tests validan que todos los componentes funcionen juntos correctamente.
 """
 
 import pytest
+import io
 import json
 import time
 import httpx
 from typing import Dict, Any, List
 
+# Tags serializados una sola vez como el array JSON que esperan los endpoints de upload
+_JOURNEY_TAGS_JSON = json.dumps(["integration", "test", "medical"])
+_BATCH_TAGS_JSON = json.dumps(["batch", "integration", "test"])
 
 class TestCompleteUserJourney:
     """Tests del recorrido completo del usuario a través del sistema."""
@@ -29,21 +33,20 @@ class TestCompleteUserJourney:
         """
         
         # 1. Subir documento
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (sample_medical_pdf_file["filename"], file, "application/pdf")}
-            data = {
-                "user_id": test_user_data["user_id"],
-                "description": "Documento médico de prueba completa",
-                "tags": json.dumps(["integration", "test", "medical"])
-            }
-            
-            upload_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert upload_response.status_code == 201
-            
-            upload_result = upload_response.json()
-            document_id = upload_result["document_id"]
-            
-            print(f"✓ Documento subido exitosamente: {document_id}")
+        files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {
+            "user_id": test_user_data["user_id"],
+            "description": "Documento médico de prueba completa",
+            "tags": _JOURNEY_TAGS_JSON
+        }
+        
+        upload_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert upload_response.status_code == 201
+        
+        upload_result = upload_response.json()
+        document_id = upload_result["document_id"]
+        
+        print(f"✓ Documento subido exitosamente: {document_id}")
         
         # 2. Esperar procesamiento completo
         processed_doc = wait_for_processing(api_client, document_id)
@@ -199,22 +202,19 @@ class TestCompleteUserJourney:
         files = []
         
         # Archivo 1: PDF médico
-        with open(sample_medical_pdf_file["path"], "rb") as file1:
-            files.append(("files", (sample_medical_pdf_file["filename"], file1.read(), "application/pdf")))
+        files.append(("files", (sample_medical_pdf_file["filename"], sample_medical_pdf_file["bytes"], "application/pdf")))
         
         # Archivo 2: PDF genérico
-        with open(sample_pdf_file, "rb") as file2:
-            files.append(("files", ("documento_generico.pdf", file2.read(), "application/pdf")))
+        files.append(("files", ("documento_generico.pdf", sample_pdf_file["bytes"], "application/pdf")))
         
         # Archivo 3: Otro PDF médico con diferente paciente
         medical_filename_2 = "4000567890_MARTINEZ PEREZ, JUAN_2024010100002_CONS.pdf"
-        with open(sample_medical_pdf_file["path"], "rb") as file3:
-            files.append(("files", (medical_filename_2, file3.read(), "application/pdf")))
+        files.append(("files", (medical_filename_2, sample_medical_pdf_file["bytes"], "application/pdf")))
         
         data = {
             "user_id": test_user_data["user_id"],
             "batch_description": "Lote de documentos para testing de integración",
-            "batch_tags": json.dumps(["batch", "integration", "test"])
+            "batch_tags": _BATCH_TAGS_JSON
         }
         
         # 2. Subir lote
@@ -351,25 +351,23 @@ class TestCompleteUserJourney:
         user2_id = test_user_data["alternative_user_id"]
         
         # 1. Usuario 1 sube documento
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (sample_medical_pdf_file["filename"], file, "application/pdf")}
-            data = {"user_id": user1_id, "description": "Documento del usuario 1"}
-            
-            upload1_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert upload1_response.status_code == 201
-            
-            doc1_id = upload1_response.json()["document_id"]
+        files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {"user_id": user1_id, "description": "Documento del usuario 1"}
+        
+        upload1_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert upload1_response.status_code == 201
+        
+        doc1_id = upload1_response.json()["document_id"]
         
         # 2. Usuario 2 sube documento
         filename2 = "4000567890_MARTINEZ PEREZ, JUAN_2024010100002_CONS.pdf"
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (filename2, file, "application/pdf")}
-            data = {"user_id": user2_id, "description": "Documento del usuario 2"}
-            
-            upload2_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert upload2_response.status_code == 201
-            
-            doc2_id = upload2_response.json()["document_id"]
+        files = {"file": (filename2, io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {"user_id": user2_id, "description": "Documento del usuario 2"}
+        
+        upload2_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert upload2_response.status_code == 201
+        
+        doc2_id = upload2_response.json()["document_id"]
         
         print(f"✓ Documentos subidos por ambos usuarios")
         
@@ -455,14 +453,13 @@ class TestCompleteUserJourney:
         """
         
         # 1. Subir documento válido
-        with open(sample_pdf_file, "rb") as file:
-            files = {"file": ("valid_document.pdf", file, "application/pdf")}
-            data = {"user_id": test_user_data["user_id"]}
-            
-            upload_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert upload_response.status_code == 201
-            
-            doc_id = upload_response.json()["document_id"]
+        files = {"file": ("valid_document.pdf", io.BytesIO(sample_pdf_file["bytes"]), "application/pdf")}
+        data = {"user_id": test_user_data["user_id"]}
+        
+        upload_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert upload_response.status_code == 201
+        
+        doc_id = upload_response.json()["document_id"]
         
         print(f"✓ Documento válido subido: {doc_id}")
         
@@ -544,14 +541,13 @@ class TestCompleteUserJourney:
         # 1. Medir tiempo de subida de documento
         start_time = time.time()
         
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (sample_medical_pdf_file["filename"], file, "application/pdf")}
-            data = {"user_id": test_user_data["user_id"]}
-            
-            upload_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert upload_response.status_code == 201
-            
-            doc_id = upload_response.json()["document_id"]
+        files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {"user_id": test_user_data["user_id"]}
+        
+        upload_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert upload_response.status_code == 201
+        
+        doc_id = upload_response.json()["document_id"]
         
         upload_time = time.time() - start_time
         
@@ -664,12 +660,11 @@ class TestSystemResilience:
         
         def upload_document(thread_id):
             try:
-                with open(sample_pdf_file, "rb") as file:
-                    files = {"file": (f"concurrent_doc_{thread_id}.pdf", file, "application/pdf")}
-                    data = {"user_id": f"{test_user_data['user_id']}_{thread_id}"}
-                    
-                    response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                    results.put(("upload", thread_id, response.status_code))
+                files = {"file": (f"concurrent_doc_{thread_id}.pdf", io.BytesIO(sample_pdf_file["bytes"]), "application/pdf")}
+                data = {"user_id": f"{test_user_data['user_id']}_{thread_id}"}
+                
+                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+                results.put(("upload", thread_id, response.status_code))
             except Exception as e:
                 results.put(("upload", thread_id, f"Error: {e}"))
         
@@ -729,14 +724,13 @@ class TestSystemResilience:
         """Test de consistencia de datos."""
         
         # Subir documento
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (sample_medical_pdf_file["filename"], file, "application/pdf")}
-            data = {"user_id": test_user_data["user_id"]}
-            
-            upload_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert upload_response.status_code == 201
-            
-            doc_id = upload_response.json()["document_id"]
+        files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {"user_id": test_user_data["user_id"]}
+        
+        upload_response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert upload_response.status_code == 201
+        
+        doc_id = upload_response.json()["document_id"]
         
         # Esperar procesamiento
         processed_doc = wait_for_processing(api_client, doc_id)
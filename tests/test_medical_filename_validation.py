@@ -5,8 +5,7 @@ Incluye tests para single upload, batch upload y casos edge.
 
 import pytest
 import json
-import tempfile
-import os
+import io
 from typing import Dict, Any
 
 
@@ -73,219 +72,155 @@ startxref
 398
 %%EOF'''
         
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            temp_file.write(pdf_content)
-            temp_file_path = temp_file.name
-        
-        try:
-            with open(temp_file_path, "rb") as file:
-                files = {"file": (valid_filename, file, "application/pdf")}
-                data = {"user_id": "test_user"}
-                
-                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                assert response.status_code == 201
-                result = response.json()
-                
-                # Verificar que la información médica se extrajo correctamente
-                assert result["expediente"] == "4000123456"
-                assert result["nombre_paciente"] == "GARCIA LOPEZ, MARIA"
-                assert result["numero_episodio"] == "6001467010"  # Ahora es 10 dígitos
-                assert result["categoria"] == "EMER"
-                assert result["medical_info_valid"] is True
-        finally:
-            os.unlink(temp_file_path)
+        files = {"file": (valid_filename, io.BytesIO(pdf_content), "application/pdf")}
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 201
+        result = response.json()
+        
+        # Verificar que la información médica se extrajo correctamente
+        assert result["expediente"] == "4000123456"
+        assert result["nombre_paciente"] == "GARCIA LOPEZ, MARIA"
+        assert result["numero_episodio"] == "6001467010"  # Ahora es 10 dígitos
+        assert result["categoria"] == "EMER"
+        assert result["medical_info_valid"] is True
 
     def test_upload_document_invalid_medical_filename_format(self, api_client, clean_database):
         """Test de error con filename médico inválido - formato incorrecto."""
         invalid_filename = "documento_invalido.pdf"
         
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            temp_file.write(b"PDF content")
-            temp_file_path = temp_file.name
-        
-        try:
-            with open(temp_file_path, "rb") as file:
-                files = {"file": (invalid_filename, file, "application/pdf")}
-                data = {"user_id": "test_user"}
-                
-                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                
-                assert response.status_code == 400
-                
-                result = response.json()
-                # La respuesta real tiene un handler global que envuelve el error específico
-                assert result["error_code"] == "HTTP_400"
-                
-                # El error específico está dentro de error_message
-                error_details = result["error_message"]
-                assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
-                assert "formato médico requerido" in error_details["message"]
-                assert error_details["filename"] == invalid_filename
-                assert "detailed_error" in error_details
-                # Verificar mensaje específico sobre longitud de episodio
-                assert "Faltan componentes" in error_details["detailed_error"]
-        finally:
-            os.unlink(temp_file_path)
+        files = {"file": (invalid_filename, io.BytesIO(b"PDF content"), "application/pdf")}
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        
+        assert response.status_code == 400
+        
+        result = response.json()
+        # La respuesta real tiene un handler global que envuelve el error específico
+        assert result["error_code"] == "HTTP_400"
+        
+        # El error específico está dentro de error_message
+        error_details = result["error_message"]
+        assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
+        assert "formato médico requerido" in error_details["message"]
+        assert error_details["filename"] == invalid_filename
+        assert "detailed_error" in error_details
+        # Verificar mensaje específico sobre longitud de episodio
+        assert "Faltan componentes" in error_details["detailed_error"]
 
     def test_upload_document_invalid_expediente_length(self, api_client, clean_database):
         """Test de error con expediente de longitud incorrecta."""
         invalid_filename = "12345_GARCIA LOPEZ, MARIA_2024010100001_EMER.pdf"  # Expediente muy corto
         
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            temp_file.write(b"PDF content")
-            temp_file_path = temp_file.name
-        
-        try:
-            with open(temp_file_path, "rb") as file:
-                files = {"file": (invalid_filename, file, "application/pdf")}
-                data = {"user_id": "test_user"}
-                
-                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                
-                assert response.status_code == 400
-                
-                result = response.json()
-                assert result["error_code"] == "HTTP_400"
-                
-                error_details = result["error_message"]
-                assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
-                assert "10 dígitos" in error_details["detailed_error"]
-        finally:
-            os.unlink(temp_file_path)
+        files = {"file": (invalid_filename, io.BytesIO(b"PDF content"), "application/pdf")}
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        
+        assert response.status_code == 400
+        
+        result = response.json()
+        assert result["error_code"] == "HTTP_400"
+        
+        error_details = result["error_message"]
+        assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
+        assert "10 dígitos" in error_details["detailed_error"]
 
     def test_upload_document_invalid_patient_name_format(self, api_client, clean_database):
         """Test que un archivo sin coma en el nombre del paciente sea rechazado."""
         invalid_filename = "4000123456_GARCIA LOPEZ MARIA_6001467010_EMER.pdf"  # Falta coma
 
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            temp_file.write(b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n>>\nendobj\nstartxref\n0\n%%EOF")
-            temp_file_path = temp_file.name
-
-        try:
-            with open(temp_file_path, "rb") as file:
-                files = {"file": (invalid_filename, file, "application/pdf")}
-                data = {"user_id": "test_user"}
-                
-                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                assert response.status_code == 400
-                result = response.json()
-                assert result["error_code"] == "HTTP_400"
-                error_details = result["error_message"]
-                assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
-                assert "formato médico requerido" in error_details["message"]
-                assert error_details["filename"] == invalid_filename
-                assert "detailed_error" in error_details
-                # El parser rechaza por formato general, no específicamente por coma
-                assert "coma separando apellidos" in error_details["detailed_error"]
-        finally:
-            os.unlink(temp_file_path)
+        files = {"file": (invalid_filename, io.BytesIO(b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n>>\nendobj\nstartxref\n0\n%%EOF"), "application/pdf")}
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 400
+        result = response.json()
+        assert result["error_code"] == "HTTP_400"
+        error_details = result["error_message"]
+        assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
+        assert "formato médico requerido" in error_details["message"]
+        assert error_details["filename"] == invalid_filename
+        assert "detailed_error" in error_details
+        # El parser rechaza por formato general, no específicamente por coma
+        assert "coma separando apellidos" in error_details["detailed_error"]
 
     def test_upload_document_invalid_episode_length(self, api_client, clean_database):
         """Test que un archivo con número de episodio de longitud incorrecta sea rechazado."""
         invalid_filename = "4000123456_GARCIA LOPEZ, MARIA_12345_EMER.pdf"  # Solo 5 dígitos en lugar de 10
         
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            temp_file.write(b"PDF content")
-            temp_file_path = temp_file.name
-        
-        try:
-            with open(temp_file_path, "rb") as file:
-                files = {"file": (invalid_filename, file, "application/pdf")}
-                data = {"user_id": "test_user"}
-                
-                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                
-                assert response.status_code == 400
-                
-                result = response.json()
-                assert result["error_code"] == "HTTP_400"
-                
-                error_details = result["error_message"]
-                assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
-                # El parser rechazará esto por no ser dígitos
-                assert "debe tener 10 dígitos" in error_details["detailed_error"]
-        finally:
-            os.unlink(temp_file_path)
+        files = {"file": (invalid_filename, io.BytesIO(b"PDF content"), "application/pdf")}
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        
+        assert response.status_code == 400
+        
+        result = response.json()
+        assert result["error_code"] == "HTTP_400"
+        
+        error_details = result["error_message"]
+        assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
+        # El parser rechazará esto por no ser dígitos
+        assert "debe tener 10 dígitos" in error_details["detailed_error"]
 
     def test_upload_document_invalid_medical_category(self, api_client, clean_database):
         """Test que un archivo con categoría médica inválida sea rechazado."""
         invalid_filename = "4000123456_GARCIA LOPEZ, MARIA_6001467010_XXXX.pdf"  # Categoría inválida
 
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            temp_file.write(b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n>>\nendobj\nstartxref\n0\n%%EOF")
-            temp_file_path = temp_file.name
-
-        try:
-            with open(temp_file_path, "rb") as file:
-                files = {"file": (invalid_filename, file, "application/pdf")}
-                data = {"user_id": "test_user"}
-                
-                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                assert response.status_code == 400
-                result = response.json()
-                assert result["error_code"] == "HTTP_400"
-                error_details = result["error_message"]
-                assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
-                assert "formato médico requerido" in error_details["message"]
-                assert error_details["filename"] == invalid_filename
-                assert "detailed_error" in error_details
-                # Verificar que menciona el problema de categoría
-                assert "Categoría médica inválida" in error_details["detailed_error"]
-        finally:
-            os.unlink(temp_file_path)
+        files = {"file": (invalid_filename, io.BytesIO(b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n>>\nendobj\nstartxref\n0\n%%EOF"), "application/pdf")}
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 400
+        result = response.json()
+        assert result["error_code"] == "HTTP_400"
+        error_details = result["error_message"]
+        assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
+        assert "formato médico requerido" in error_details["message"]
+        assert error_details["filename"] == invalid_filename
+        assert "detailed_error" in error_details
+        # Verificar que menciona el problema de categoría
+        assert "Categoría médica inválida" in error_details["detailed_error"]
 
     def test_upload_document_non_pdf_extension(self, api_client, clean_database):
         """Test de error con archivo que no es PDF."""
         invalid_filename = "4000123456_GARCIA LOPEZ, MARIA_2024010100001_EMER.txt"  # No PDF
         
-        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as temp_file:
-            temp_file.write(b"Text content")
-            temp_file_path = temp_file.name
-        
-        try:
-            with open(temp_file_path, "rb") as file:
-                files = {"file": (invalid_filename, file, "text/plain")}
-                data = {"user_id": "test_user"}
-                
-                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                
-                assert response.status_code == 400
-                
-                result = response.json()
-                assert result["error_code"] == "HTTP_400"
-                
-                error_details = result["error_message"]
-                assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
-                assert "debe ser PDF" in error_details["detailed_error"]
-        finally:
-            os.unlink(temp_file_path)
+        files = {"file": (invalid_filename, io.BytesIO(b"Text content"), "text/plain")}
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        
+        assert response.status_code == 400
+        
+        result = response.json()
+        assert result["error_code"] == "HTTP_400"
+        
+        error_details = result["error_message"]
+        assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
+        assert "debe ser PDF" in error_details["detailed_error"]
 
     def test_upload_document_invalid_episode_date(self, api_client, clean_database):
         """Test que un archivo con fecha inválida en episodio sea rechazado."""
         # Usar un número de episodio que simplemente sea inválido por otros motivos
         invalid_filename = "4000123456_GARCIA LOPEZ, MARIA_abcdefghij_EMER.pdf"  # Letras en lugar de dígitos
         
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            temp_file.write(b"PDF content")
-            temp_file_path = temp_file.name
-        
-        try:
-            with open(temp_file_path, "rb") as file:
-                files = {"file": (invalid_filename, file, "application/pdf")}
-                data = {"user_id": "test_user"}
-                
-                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                
-                assert response.status_code == 400
-                
-                result = response.json()
-                assert result["error_code"] == "HTTP_400"
-                
-                error_details = result["error_message"]
-                assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
-                assert "debe ser numérico" in error_details["detailed_error"]
-        finally:
-            os.unlink(temp_file_path)
+        files = {"file": (invalid_filename, io.BytesIO(b"PDF content"), "application/pdf")}
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        
+        assert response.status_code == 400
+        
+        result = response.json()
+        assert result["error_code"] == "HTTP_400"
+        
+        error_details = result["error_message"]
+        assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME"
+        assert "debe ser numérico" in error_details["detailed_error"]
 
 
 class TestBatchMedicalFilenameValidation:
@@ -358,43 +293,28 @@ startxref
 341
 %%EOF"""
         
-        temp_files = []
-        files_data = []
-        
-        try:
-            # Crear archivos temporales con contenido PDF válido
-            for filename in valid_files:
-                temp_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
-                temp_file.write(pdf_content)
-                temp_file.close()
-                temp_files.append(temp_file.name)
-                
-                files_data.append(("files", (filename, open(temp_file.name, "rb"), "application/pdf")))
-            
-            data = {"user_id": "test_user", "batch_description": "Test batch válido"}
-            
-            response = api_client.post("/api/v1/documents/upload/batch", files=files_data, data=data)
-            
-            assert response.status_code == 201
-            
-            result = response.json()
-            assert result["total_files"] == 3
-            assert result["processed_count"] == 3
-            assert result["failed_count"] == 0
-            assert result["processing_status"] == "completed"
-            
-            # Verificar documentos exitosos
-            for doc in result["successful_documents"]:
-                assert doc["medical_info_valid"] is True
-                assert doc["expediente"] is not None
-                assert doc["nombre_paciente"] is not None
-                
-        finally:
-            # Cerrar archivos y limpiar
-            for file_tuple in files_data:
-                file_tuple[1][1].close()
-            for temp_file_path in temp_files:
-                os.unlink(temp_file_path)
+        files_data = [
+            ("files", (filename, io.BytesIO(pdf_content), "application/pdf"))
+            for filename in valid_files
+        ]
+        
+        data = {"user_id": "test_user", "batch_description": "Test batch válido"}
+        
+        response = api_client.post("/api/v1/documents/upload/batch", files=files_data, data=data)
+        
+        assert response.status_code == 201
+        
+        result = response.json()
+        assert result["total_files"] == 3
+        assert result["processed_count"] == 3
+        assert result["failed_count"] == 0
+        assert result["processing_status"] == "completed"
+        
+        # Verificar documentos exitosos
+        for doc in result["successful_documents"]:
+            assert doc["medical_info_valid"] is True
+            assert doc["expediente"] is not None
+            assert doc["nombre_paciente"] is not None
 
     def test_batch_upload_one_invalid_medical_filename(self, api_client, clean_database):
         """Test de batch upload que falla completamente si UN archivo tiene filename inválido."""
@@ -404,41 +324,26 @@ startxref
             "3000987654_MARTINEZ RODRIGUEZ, CARLOS_6001467011_CONS.pdf"  # Válido
         ]
         
-        temp_files = []
-        files_data = []
-        
-        try:
-            # Crear archivos temporales
-            for filename in mixed_files:
-                temp_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
-                temp_file.write(b"PDF content")
-                temp_file.close()
-                temp_files.append(temp_file.name)
-                
-                files_data.append(("files", (filename, open(temp_file.name, "rb"), "application/pdf")))
-            
-            data = {"user_id": "test_user"}
-            
-            response = api_client.post("/api/v1/documents/upload/batch", files=files_data, data=data)
-            
-            # El batch completo debe fallar por el archivo inválido
-            assert response.status_code == 400
-            
-            result = response.json()
-            assert result["error_code"] == "HTTP_400"
-            
-            error_details = result["error_message"]
-            assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME_BATCH"
-            assert "no cumplen con el formato médico" in error_details["message"]
-            assert error_details["file_count"] == 3
-            assert "documento_invalido.pdf" in error_details["detailed_error"]
-            
-        finally:
-            # Cerrar archivos y limpiar
-            for file_tuple in files_data:
-                file_tuple[1][1].close()
-            for temp_file_path in temp_files:
-                os.unlink(temp_file_path)
+        files_data = [
+            ("files", (filename, io.BytesIO(b"PDF content"), "application/pdf"))
+            for filename in mixed_files
+        ]
+        
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload/batch", files=files_data, data=data)
+        
+        # El batch completo debe fallar por el archivo inválido
+        assert response.status_code == 400
+        
+        result = response.json()
+        assert result["error_code"] == "HTTP_400"
+        
+        error_details = result["error_message"]
+        assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME_BATCH"
+        assert "no cumplen con el formato médico" in error_details["message"]
+        assert error_details["file_count"] == 3
+        assert "documento_invalido.pdf" in error_details["detailed_error"]
 
     def test_batch_upload_invalid_category_in_batch(self, api_client, clean_database):
         """Test de batch upload que falla por categoría inválida en uno de los archivos."""
@@ -447,39 +352,24 @@ startxref
             "3000987654_MARTINEZ RODRIGUEZ, CARLOS_6001467011_XXXX.pdf"  # Categoría inválida
         ]
         
-        temp_files = []
-        files_data = []
-        
-        try:
-            # Crear archivos temporales
-            for filename in invalid_batch_files:
-                temp_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
-                temp_file.write(b"PDF content")
-                temp_file.close()
-                temp_files.append(temp_file.name)
-                
-                files_data.append(("files", (filename, open(temp_file.name, "rb"), "application/pdf")))
-            
-            data = {"user_id": "test_user"}
-            
-            response = api_client.post("/api/v1/documents/upload/batch", files=files_data, data=data)
-            
-            # El batch completo debe fallar
-            assert response.status_code == 400
-            
-            result = response.json()
-            assert result["error_code"] == "HTTP_400"
-            
-            error_details = result["error_message"]
-            assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME_BATCH"
-            assert "Categoría médica inválida" in error_details["detailed_error"]
-            
-        finally:
-            # Cerrar archivos y limpiar
-            for file_tuple in files_data:
-                file_tuple[1][1].close()
-            for temp_file_path in temp_files:
-                os.unlink(temp_file_path)
+        files_data = [
+            ("files", (filename, io.BytesIO(b"PDF content"), "application/pdf"))
+            for filename in invalid_batch_files
+        ]
+        
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload/batch", files=files_data, data=data)
+        
+        # El batch completo debe fallar
+        assert response.status_code == 400
+        
+        result = response.json()
+        assert result["error_code"] == "HTTP_400"
+        
+        error_details = result["error_message"]
+        assert error_details["error_code"] == "INVALID_MEDICAL_FILENAME_BATCH"
+        assert "Categoría médica inválida" in error_details["detailed_error"]
 
 
 class TestMedicalFilenameValidationEdgeCases:
@@ -548,24 +438,16 @@ startxref
         for i, category in enumerate(valid_categories):
             filename = f"400012345{i}_GARCIA LOPEZ, MARIA_600146701{i}_{category}.pdf"
             
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-                temp_file.write(pdf_content)
-                temp_file_path = temp_file.name
+            files = {"file": (filename, io.BytesIO(pdf_content), "application/pdf")}
+            data = {"user_id": "test_user"}
+            
+            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+            
+            assert response.status_code == 201, f"Failed for category {category}"
             
-            try:
-                with open(temp_file_path, "rb") as file:
-                    files = {"file": (filename, file, "application/pdf")}
-                    data = {"user_id": "test_user"}
-                    
-                    response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                    
-                    assert response.status_code == 201, f"Failed for category {category}"
-                    
-                    result = response.json()
-                    assert result["categoria"] == category
-                    assert result["medical_info_valid"] is True
-            finally:
-                os.unlink(temp_file_path)
+            result = response.json()
+            assert result["categoria"] == category
+            assert result["medical_info_valid"] is True
 
     def test_patient_name_with_special_characters(self, api_client, clean_database):
         """Test que nombres de pacientes con caracteres especiales funcionen."""
@@ -635,24 +517,16 @@ startxref
         for i, name in enumerate(special_names):
             filename = f"400012345{i}_{name}_600146701{i}_CONS.pdf"
             
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-                temp_file.write(pdf_content)
-                temp_file_path = temp_file.name
+            files = {"file": (filename, io.BytesIO(pdf_content), "application/pdf")}
+            data = {"user_id": "test_user"}
+            
+            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
             
-            try:
-                with open(temp_file_path, "rb") as file:
-                    files = {"file": (filename, file, "application/pdf")}
-                    data = {"user_id": "test_user"}
-                    
-                    response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                    
-                    assert response.status_code == 201, f"Failed for name {name}"
-                    
-                    result = response.json()
-                    assert result["nombre_paciente"] == name.upper()
-                    assert result["medical_info_valid"] is True
-            finally:
-                os.unlink(temp_file_path)
+            assert response.status_code == 201, f"Failed for name {name}"
+            
+            result = response.json()
+            assert result["nombre_paciente"] == name.upper()
+            assert result["medical_info_valid"] is True
 
     def test_edge_case_date_validation(self, api_client, clean_database):
         """Test casos extremos de validación de números de episodio."""
@@ -722,56 +596,39 @@ startxref
         for episode_number in valid_cases:
             filename = f"4000123456_GARCIA LOPEZ, MARIA_{episode_number}_EMER.pdf"
             
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-                temp_file.write(pdf_content)
-                temp_file_path = temp_file.name
+            files = {"file": (filename, io.BytesIO(pdf_content), "application/pdf")}
+            data = {"user_id": "test_user"}
             
-            try:
-                with open(temp_file_path, "rb") as file:
-                    files = {"file": (filename, file, "application/pdf")}
-                    data = {"user_id": "test_user"}
-                    
-                    response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                    
-                    assert response.status_code == 201, f"Failed for valid date {episode_number}"
-                    result = response.json()
-                    assert result["numero_episodio"] == episode_number
-                    assert result["medical_info_valid"] is True
-            finally:
-                os.unlink(temp_file_path)
+            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+            
+            assert response.status_code == 201, f"Failed for valid date {episode_number}"
+            result = response.json()
+            assert result["numero_episodio"] == episode_number
+            assert result["medical_info_valid"] is True
 
     def test_error_message_quality(self, api_client, clean_database):
         """Test para verificar la calidad y utilidad de los mensajes de error."""
         invalid_filename = "invalid_format.pdf"
         
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            temp_file.write(b"PDF content")
-            temp_file_path = temp_file.name
-        
-        try:
-            with open(temp_file_path, "rb") as file:
-                files = {"file": (invalid_filename, file, "application/pdf")}
-                data = {"user_id": "test_user"}
-                
-                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                
-                assert response.status_code == 400
-                
-                result = response.json()
-                assert result["error_code"] == "HTTP_400"
-                
-                # Verificar que el mensaje de error es útil
-                detailed_error = result["error_message"]["detailed_error"]
-                assert "Formato esperado" in detailed_error
-                assert "EXPEDIENTE" in detailed_error
-                assert "NOMBRE_PACIENTE" in detailed_error
-                assert "NUMERO_EPISODIO" in detailed_error
-                assert "CATEGORIA" in detailed_error
-                assert "Ejemplos válidos" in detailed_error
-                assert "4000123456_GARCIA LOPEZ, MARIA_6001467010_EMER.pdf" in detailed_error
-                
-                # Verificar que incluye diagnóstico específico del error
-                assert "Faltan componentes" in detailed_error or "formato general incorrecto" in detailed_error.lower()
-                
-        finally:
-            os.unlink(temp_file_path) 
\ No newline at end of file
+        files = {"file": (invalid_filename, io.BytesIO(b"PDF content"), "application/pdf")}
+        data = {"user_id": "test_user"}
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        
+        assert response.status_code == 400
+        
+        result = response.json()
+        assert result["error_code"] == "HTTP_400"
+        
+        # Verificar que el mensaje de error es útil
+        detailed_error = result["error_message"]["detailed_error"]
+        assert "Formato esperado" in detailed_error
+        assert "EXPEDIENTE" in detailed_error
+        assert "NOMBRE_PACIENTE" in detailed_error
+        assert "NUMERO_EPISODIO" in detailed_error
+        assert "CATEGORIA" in detailed_error
+        assert "Ejemplos válidos" in detailed_error
+        assert "4000123456_GARCIA LOPEZ, MARIA_6001467010_EMER.pdf" in detailed_error
+        
+        # Verificar que incluye diagnóstico específico del error
+        assert "Faltan componentes" in detailed_error or "formato general incorrecto" in detailed_error.lower()
\ No newline at end of file
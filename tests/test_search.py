@@ -4,6 +4,7 @@ Incluye búsqueda por nombre, sugerencias y obtención de documentos por pacient
 """
 
 import pytest
+import io
 import json
 import time
 from typing import Dict, Any, List
@@ -482,18 +483,17 @@ class TestSearchWorkflow:
             # Crear nombre de archivo único pero mismo paciente
             filename = f"4000123456_GARCIA LOPEZ, MARIA_20240101000{i+1}_EMER.pdf"
             
-            with open(sample_medical_pdf_file["path"], "rb") as file:
-                files = {"file": (filename, file, "application/pdf")}
-                data = {"user_id": test_user_data["user_id"]}
-                
-                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                assert response.status_code == 201
-                
-                document_id = response.json()["document_id"]
-                document_ids.append(document_id)
-                
-                # Esperar procesamiento
-                wait_for_processing(api_client, document_id)
+            files = {"file": (filename, io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+            data = {"user_id": test_user_data["user_id"]}
+            
+            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+            assert response.status_code == 201
+            
+            document_id = response.json()["document_id"]
+            document_ids.append(document_id)
+            
+            # Esperar procesamiento
+            wait_for_processing(api_client, document_id)
         
         # Buscar por nombre de paciente
         patient_name = "GARCIA LOPEZ, MARIA"
@@ -528,18 +528,17 @@ class TestSearchWorkflow:
             for j in range(2):
                 filename = f"400012345{i}_{'_'.join(patient.split(', '))}_20240101000{j+1}_CONS.pdf"
                 
-                with open(sample_medical_pdf_file["path"], "rb") as file:
-                    files = {"file": (filename, file, "application/pdf")}
-                    data = {"user_id": test_user_data["user_id"]}
-                    
-                    response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-                    assert response.status_code == 201
-                    
-                    document_id = response.json()["document_id"]
-                    document_ids.append(document_id)
-                    
-                    # Esperar procesamiento
-                    wait_for_processing(api_client, document_id)
+                files = {"file": (filename, io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+                data = {"user_id": test_user_data["user_id"]}
+                
+                response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+                assert response.status_code == 201
+                
+                document_id = response.json()["document_id"]
+                document_ids.append(document_id)
+                
+                # Esperar procesamiento
+                wait_for_processing(api_client, document_id)
         
         # Test de rendimiento de búsqueda
         start_time = time.time()
@@ -4,6 +4,7 @@ Incluye tests para asegurar que los usuarios solo puedan ver sus propios documen
 """
 
 import pytest
+import io
 import json
 import uuid
 from typing import Dict, Any
@@ -82,34 +83,32 @@ class TestUserIdDocumentIsolation:
         user2_id = "user2_test"
         
         # Subir documento para user1
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (sample_medical_pdf_file["filename"], file, "application/pdf")}
-            data = {
-                "user_id": user1_id,
-                "description": "Documento de user1"
-            }
-            
-            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert response.status_code == 201
-            
-            # Esperar procesamiento
-            doc1 = wait_for_processing(api_client, response.json()["document_id"])
-            assert doc1["processing_status"] == "completed"
+        files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {
+            "user_id": user1_id,
+            "description": "Documento de user1"
+        }
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 201
+        
+        # Esperar procesamiento
+        doc1 = wait_for_processing(api_client, response.json()["document_id"])
+        assert doc1["processing_status"] == "completed"
         
         # Subir documento para user2
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (f"user2_{sample_medical_pdf_file['filename']}", file, "application/pdf")}
-            data = {
-                "user_id": user2_id,
-                "description": "Documento de user2"
-            }
-            
-            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert response.status_code == 201
-            
-            # Esperar procesamiento
-            doc2 = wait_for_processing(api_client, response.json()["document_id"])
-            assert doc2["processing_status"] == "completed"
+        files = {"file": (f"user2_{sample_medical_pdf_file['filename']}", io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {
+            "user_id": user2_id,
+            "description": "Documento de user2"
+        }
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 201
+        
+        # Esperar procesamiento
+        doc2 = wait_for_processing(api_client, response.json()["document_id"])
+        assert doc2["processing_status"] == "completed"
         
         # User1 debería ver solo su documento
         response = api_client.get(f"/api/v1/documents/?user_id={user1_id}")
@@ -137,34 +136,32 @@ class TestUserIdDocumentIsolation:
         user2_id = "user2_test"
         
         # Subir documento para user1
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (sample_medical_pdf_file["filename"], file, "application/pdf")}
-            data = {
-                "user_id": user1_id,
-                "description": "Documento de user1"
-            }
-            
-            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert response.status_code == 201
-            
-            # Esperar procesamiento
-            doc1 = wait_for_processing(api_client, response.json()["document_id"])
-            assert doc1["processing_status"] == "completed"
+        files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {
+            "user_id": user1_id,
+            "description": "Documento de user1"
+        }
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 201
+        
+        # Esperar procesamiento
+        doc1 = wait_for_processing(api_client, response.json()["document_id"])
+        assert doc1["processing_status"] == "completed"
         
         # Subir documento para user2 con mismo nombre de paciente
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (f"user2_{sample_medical_pdf_file['filename']}", file, "application/pdf")}
-            data = {
-                "user_id": user2_id,
-                "description": "Documento de user2"
-            }
-            
-            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert response.status_code == 201
-            
-            # Esperar procesamiento
-            doc2 = wait_for_processing(api_client, response.json()["document_id"])
-            assert doc2["processing_status"] == "completed"
+        files = {"file": (f"user2_{sample_medical_pdf_file['filename']}", io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {
+            "user_id": user2_id,
+            "description": "Documento de user2"
+        }
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 201
+        
+        # Esperar procesamiento
+        doc2 = wait_for_processing(api_client, response.json()["document_id"])
+        assert doc2["processing_status"] == "completed"
         
         # Buscar paciente como user1
         patient_name = sample_medical_pdf_file["nombre_paciente"]
@@ -191,34 +188,32 @@ class TestUserIdDocumentIsolation:
         user2_id = "user2_test"
         
         # Subir documento para user1
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (sample_medical_pdf_file["filename"], file, "application/pdf")}
-            data = {
-                "user_id": user1_id,
-                "description": "Documento de user1"
-            }
-            
-            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert response.status_code == 201
-            
-            # Esperar procesamiento
-            doc1 = wait_for_processing(api_client, response.json()["document_id"])
-            assert doc1["processing_status"] == "completed"
+        files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {
+            "user_id": user1_id,
+            "description": "Documento de user1"
+        }
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 201
+        
+        # Esperar procesamiento
+        doc1 = wait_for_processing(api_client, response.json()["document_id"])
+        assert doc1["processing_status"] == "completed"
         
         # Subir documento para user2
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (f"user2_{sample_medical_pdf_file['filename']}", file, "application/pdf")}
-            data = {
-                "user_id": user2_id,
-                "description": "Documento de user2"
-            }
-            
-            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert response.status_code == 201
-            
-            # Esperar procesamiento
-            doc2 = wait_for_processing(api_client, response.json()["document_id"])
-            assert doc2["processing_status"] == "completed"
+        files = {"file": (f"user2_{sample_medical_pdf_file['filename']}", io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {
+            "user_id": user2_id,
+            "description": "Documento de user2"
+        }
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 201
+        
+        # Esperar procesamiento
+        doc2 = wait_for_processing(api_client, response.json()["document_id"])
+        assert doc2["processing_status"] == "completed"
         
         # Obtener sugerencias para user1
         partial_name = sample_medical_pdf_file["nombre_paciente"][:5]
@@ -243,34 +238,32 @@ class TestUserIdDocumentIsolation:
         user2_id = "user2_test"
         
         # Subir documento para user1
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (sample_medical_pdf_file["filename"], file, "application/pdf")}
-            data = {
-                "user_id": user1_id,
-                "description": "Documento de user1"
-            }
-            
-            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert response.status_code == 201
-            
-            # Esperar procesamiento
-            doc1 = wait_for_processing(api_client, response.json()["document_id"])
-            assert doc1["processing_status"] == "completed"
+        files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {
+            "user_id": user1_id,
+            "description": "Documento de user1"
+        }
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 201
+        
+        # Esperar procesamiento
+        doc1 = wait_for_processing(api_client, response.json()["document_id"])
+        assert doc1["processing_status"] == "completed"
         
         # Subir documento para user2
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (f"user2_{sample_medical_pdf_file['filename']}", file, "application/pdf")}
-            data = {
-                "user_id": user2_id,
-                "description": "Documento de user2"
-            }
-            
-            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert response.status_code == 201
-            
-            # Esperar procesamiento
-            doc2 = wait_for_processing(api_client, response.json()["document_id"])
-            assert doc2["processing_status"] == "completed"
+        files = {"file": (f"user2_{sample_medical_pdf_file['filename']}", io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {
+            "user_id": user2_id,
+            "description": "Documento de user2"
+        }
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 201
+        
+        # Esperar procesamiento
+        doc2 = wait_for_processing(api_client, response.json()["document_id"])
+        assert doc2["processing_status"] == "completed"
         
         # Buscar documentos del paciente como user1
         patient_name = sample_medical_pdf_file["nombre_paciente"]
@@ -365,19 +358,18 @@ class TestUserIdWorkflow:
         user_id = "test_user_workflow"
         
         # 1. Subir documento
-        with open(sample_medical_pdf_file["path"], "rb") as file:
-            files = {"file": (sample_medical_pdf_file["filename"], file, "application/pdf")}
-            data = {
-                "user_id": user_id,
-                "description": "Documento de prueba para workflow"
-            }
-            
-            response = api_client.post("/api/v1/documents/upload", files=files, data=data)
-            assert response.status_code == 201
-            
-            # Esperar procesamiento
-            doc = wait_for_processing(api_client, response.json()["document_id"])
-            assert doc["processing_status"] == "completed"
+        files = {"file": (sample_medical_pdf_file["filename"], io.BytesIO(sample_medical_pdf_file["bytes"]), "application/pdf")}
+        data = {
+            "user_id": user_id,
+            "description": "Documento de prueba para workflow"
+        }
+        
+        response = api_client.post("/api/v1/documents/upload", files=files, data=data)
+        assert response.status_code == 201
+        
+        # Esperar procesamiento
+        doc = wait_for_processing(api_client, response.json()["document_id"])
+        assert doc["processing_status"] == "completed"
         
         # 2. Listar documentos del usuario
         response = api_client.get(f"/api/v1/documents/?user_id={user_id}")
@@ -3,12 +3,120 @@ Utilidades auxiliares para los tests de TecSalud MVP.
 """
 
 import json
+import re
 import time
 import tempfile
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime, timedelta
 import httpx
+import orjson
+import pytest
+
+
+# Línea SSE "data: <json>" completa (terminada en salto de línea)
+_SSE_DATA_RE = re.compile(rb"^data: ([^\n]+)\n", re.MULTILINE)
+
+
+def iter_sse_events(response: httpx.Response) -> Iterator[Dict[str, Any]]:
+    """
+    Decodificar los eventos `data:` de una respuesta SSE en streaming.
+
+    Acumula los bytes recibidos y aplica la expresión regular precompilada
+    sobre el buffer; la línea parcial final se conserva para el siguiente chunk.
+    """
+    buffer = b""
+    for chunk in response.iter_bytes():
+        buffer += chunk
+        last_end = 0
+        for match in _SSE_DATA_RE.finditer(buffer):
+            last_end = match.end()
+            try:
+                yield orjson.loads(match.group(1))
+            except orjson.JSONDecodeError:
+                continue
+        buffer = buffer[last_end:]
+
+
+def rjson(response: httpx.Response) -> Any:
+    """Decodificar el cuerpo JSON de una respuesta directamente desde bytes."""
+    return orjson.loads(response.content)
+
+
+# Cadenas de texto "(...) Tj" de los PDF de prueba
+_PDF_TEXT_RE = re.compile(rb"\(([^)]*)\)\s*Tj")
+
+
+class InMemoryAzureIO:
+    """
+    Sustitutos en proceso de Azure Blob Storage y Document Intelligence.
+    
+    Los blobs se guardan en un diccionario y el OCR devuelve el texto de los
+    operadores Tj del PDF, así los endpoints recorren el flujo completo sin red.
+    """
+    
+    BLOB_BASE_URL = "https://testaccount.blob.core.windows.net/documents"
+    
+    def __init__(self):
+        self.blobs: Dict[str, bytes] = {}
+        self._patcher: Optional[pytest.MonkeyPatch] = None
+    
+    @property
+    def installed(self) -> bool:
+        return self._patcher is not None
+    
+    def install(self) -> None:
+        """Reemplazar los métodos de E/S de StorageManager y OCRManager."""
+        from app.core.v1.ocr_manager import OCRManager
+        from app.core.v1.storage_manager import StorageManager
+        
+        self._patcher = pytest.MonkeyPatch()
+        self._patcher.setattr(StorageManager, "_ensure_container_exists", lambda manager: None)
+        self._patcher.setattr(StorageManager, "upload_file", self.upload_file)
+        self._patcher.setattr(StorageManager, "delete_file", self.delete_file)
+        self._patcher.setattr(OCRManager, "extract_text_from_bytes", self.extract_text_from_bytes)
+    
+    def uninstall(self) -> None:
+        """Restaurar los métodos originales."""
+        if self._patcher is not None:
+            self._patcher.undo()
+            self._patcher = None
+    
+    def upload_file(
+        self,
+        file_content: bytes,
+        blob_name: str,
+        content_type: str = "application/octet-stream"
+    ) -> Dict[str, Any]:
+        self.blobs[blob_name] = file_content
+        return {
+            "blob_name": blob_name,
+            "url": f"{self.BLOB_BASE_URL}/{blob_name}",
+            "file_size": len(file_content),
+            "content_type": content_type
+        }
+    
+    def delete_file(self, blob_name: str) -> bool:
+        return self.blobs.pop(blob_name, None) is not None
+    
+    def extract_text_from_bytes(self, file_content: bytes, content_type: str) -> Dict[str, Any]:
+        lines = [match.decode("latin-1") for match in _PDF_TEXT_RE.findall(file_content)]
+        return {
+            "extracted_text": "\n".join(lines),
+            "pages": [{
+                "page_number": 1,
+                "width": 612,
+                "height": 792,
+                "unit": "pixel",
+                "lines": [{"text": line, "bounding_box": None} for line in lines]
+            }],
+            "tables": [],
+            "page_count": 1,
+            "table_count": 0,
+            "processing_timestamp": time.time(),
+            "model_id": "prebuilt-read",
+            "api_version": None
+        }
 
 
 class TestDataGenerator:
@@ -167,12 +275,19 @@ class TestAPIHelper:
         api_client: httpx.Client,
         document_id: str,
         max_wait: int = 30,
-        poll_interval: int = 1
+        initial_interval: float = 0.01,
+        max_interval: float = 0.5
     ) -> Dict[str, Any]:
-        """Esperar a que se complete el procesamiento de un documento."""
-        start_time = time.time()
+        """
+        Esperar a que se complete el procesamiento de un documento.
         
-        while time.time() - start_time < max_wait:
+        Consulta con backoff exponencial (10ms, 20ms, ... hasta 500ms) para devolver
+        el estado final en cuanto el backend lo marca, sin esperar un intervalo fijo.
+        """
+        deadline = time.monotonic() + max_wait
+        interval = initial_interval
+        
+        while True:
             response = api_client.get(f"/api/v1/documents/{document_id}")
             
             if response.status_code == 200:
@@ -180,7 +295,12 @@ class TestAPIHelper:
                 if doc_info.get("processing_status") in ["completed", "failed"]:
                     return doc_info
             
-            time.sleep(poll_interval)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
         
         raise TimeoutError(f"Document processing did not complete within {max_wait} seconds")
     
@@ -277,17 +397,11 @@ class TestAPIHelper:
         
         events = []
         
-        with httpx.stream("POST", f"{api_client.base_url}/api/v1/chat/ask", json=question_data) as response:
+        with api_client.stream("POST", "/api/v1/chat/ask", json=question_data) as response:
             if response.status_code != 200:
                 raise Exception(f"Question failed: {response.status_code} - {response.text}")
             
-            for line in response.iter_lines():
-                if line.startswith("data: "):
-                    try:
-                        event_data = json.loads(line[6:])
-                        events.append(event_data)
-                    except json.JSONDecodeError:
-                        continue
+            events.extend(iter_sse_events(response))
         
         return events
     
@@ -318,6 +432,13 @@ class TestAPIHelper:
             pass
 
 
+# Campos del nivel superior en las respuestas de error (HTTPException envuelta por main)
+_ERROR_ENVELOPE_FIELDS = frozenset({"error_code", "error_message", "timestamp"})
+
+# Formato de los request_id que devuelve la API tras el prefijo del endpoint
+_REQUEST_ID_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+
 class TestAssertions:
     """Assertions personalizadas para tests."""
     
@@ -394,6 +515,44 @@ class TestAssertions:
         
         assert isinstance(token["issued_at"], str)
         assert len(token["issued_at"]) > 0
+    
+    @staticmethod
+    def assert_error_response(
+        response: httpx.Response,
+        status_code: int,
+        error_code: str,
+        required_fields: frozenset = frozenset(),
+        **expected: Any
+    ) -> Dict[str, Any]:
+        """
+        Verificar el envelope de error de la API y devolver su error_message.
+        
+        Comprueba el código HTTP, los campos del nivel superior, el error_code
+        interno, que error_message contenga required_fields y los valores exactos
+        indicados en expected.
+        """
+        assert response.status_code == status_code
+        
+        error_data = response.json()
+        assert _ERROR_ENVELOPE_FIELDS <= error_data.keys()
+        assert error_data["error_code"] == f"HTTP_{status_code}"
+        
+        error_message = error_data["error_message"]
+        assert error_message["error_code"] == error_code
+        
+        missing = required_fields - error_message.keys()
+        assert not missing, f"Fields {sorted(missing)} missing in error_message"
+        
+        for field, value in expected.items():
+            assert error_message[field] == value, f"Unexpected value for '{field}' in error_message"
+        
+        return error_message
+    
+    @staticmethod
+    def assert_request_id(request_id: str, prefix: str):
+        """Verificar que request_id lleva el prefijo del endpoint seguido de [A-Za-z0-9_-]+."""
+        assert request_id.startswith(prefix)
+        assert _REQUEST_ID_RE.fullmatch(request_id, len(prefix)), f"Invalid request_id format: {request_id}"
 
 
 class TestMetrics: